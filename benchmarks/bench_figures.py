@@ -0,0 +1,182 @@
+"""
+Benchmark every figure function on synthetic inputs of growing size, phase by phase.
+
+Each case runs a figure function under profiling.profile() and reports the time, peak
+memory and artist count of its phases (prepare, artists, layout, save and the draw and
+encode steps of save). The sweeps cover datasets x methods for the bar and radar charts,
+N x M heatmaps, curve lengths for the train size plots and languages x models for the
+grouped prompt bars. Peak memory is only measured with --memory, since tracing allocations
+distorts the timings. Results are printed as a table and optionally written as JSON, so
+runs before and after a change can be compared.
+
+Usage:
+    python benchmarks/bench_figures.py --quick
+    python benchmarks/bench_figures.py --output bench.json --only heatmap bar_chart
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import warnings
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from visualization_scripts.bar_chart import generate_bar_chart  # noqa: E402
+from visualization_scripts.bar_plot import plot_f1_vs_train_size, plot_score_curves  # noqa: E402
+from visualization_scripts.heatmap import generate_heatmap  # noqa: E402
+from visualization_scripts.new_bar_plot import generate_grouped_prompt_bars  # noqa: E402
+from visualization_scripts.profiling import profile  # noqa: E402
+from visualization_scripts.radar_chart import generate_radar_chart, generate_radar_grid  # noqa: E402
+
+PROMPTS = np.array(["Vanilla", "CoT", "Definition", "5 shot + CoT", "Role Play", ""])
+
+
+def bar_chart_case(num_datasets, num_methods, backend):
+    data = np.random.default_rng(0).uniform(40, 90, (num_datasets, num_methods))
+    methods = [f"{'Label' if i % 2 else 'Task'}-Specific method {i}" for i in range(num_methods)]
+    return lambda save_path: generate_bar_chart(data, [f"dataset {i}" for i in range(num_datasets)], methods,
+                                                "benchmark", backend=backend, save_path=save_path)
+
+
+def heatmap_case(num_rows, num_cols):
+    rng = np.random.default_rng(0)
+    rows, cols = np.nonzero(rng.random((num_rows, num_cols)) < 0.5)
+    relations = (rows, cols, rng.uniform(0, 100, len(rows)))
+    sources = [f"D{i % 7} - Binary - source {i}" for i in range(num_rows)]
+    targets = [f"D{i % 5} - Binary - target {i}" for i in range(num_cols)]
+    return lambda save_path: generate_heatmap(sources, targets, relations, save_path=save_path, dpi=100)
+
+
+def heatmap_batch_case(num_figures, num_labels):
+    # Heatmaps of different runs over the same labels, as a manifest renders them one after another
+    sources = [f"HASOC19 (en) - Targeted - Unintentional {i}" for i in range(num_labels)]
+    targets = [f"GermEval 18 - Fine-grained - Profanity {i}" for i in range(num_labels)]
+    runs = []
+    for seed in range(num_figures):
+        rng = np.random.default_rng(seed)
+        rows, cols = np.nonzero(rng.random((num_labels, num_labels)) < 0.5)
+        runs.append((rows, cols, rng.uniform(0, 100, len(rows))))
+
+    def render(save_path):
+        for relations in runs:
+            generate_heatmap(sources, targets, relations, annot=False, save_path=save_path, dpi=100)
+            plt.close("all")
+    return render
+
+
+def radar_case(num_datasets, num_methods):
+    data = np.random.default_rng(0).uniform(40, 90, (num_datasets, num_methods))
+    methods = [f"{'Source' if i % 2 else 'Target'} method {i}" for i in range(num_methods)]
+    return lambda save_path: generate_radar_chart(data, [f"dataset {i}" for i in range(num_datasets)], methods,
+                                                  save_path=save_path)
+
+
+def radar_grid_case(num_experiments, num_datasets, num_methods):
+    data = np.random.default_rng(0).uniform(40, 90, (num_experiments, num_datasets, num_methods))
+    methods = [f"{'Source' if i % 2 else 'Target'} method {i}" for i in range(num_methods)]
+    return lambda save_path: generate_radar_grid(data, [f"dataset {i}" for i in range(num_datasets)], methods,
+                                                 save_path=save_path, dpi=100)
+
+
+def f1_curves_case(length):
+    rng = np.random.default_rng(0)
+    train_sizes = np.arange(1, length + 1) * 10
+    curves = [np.clip(60 + np.cumsum(rng.normal(0, 0.5, length)), 20, 90) for _ in range(6)]
+    return lambda save_path: plot_f1_vs_train_size(train_sizes, *curves, save_path=save_path)
+
+
+def score_curves_case(num_groups, num_models, length, num_seeds=5):
+    rng = np.random.default_rng(0)
+    scores = 60 + np.cumsum(rng.normal(0, 0.5, (num_groups, num_models, length, num_seeds)), axis=2)
+    return lambda save_path: plot_score_curves(scores, np.arange(1, length + 1) * 10,
+                                               [f"group {i}" for i in range(num_groups)],
+                                               [f"model {i}" for i in range(num_models)], save_path=save_path)
+
+
+def grouped_bars_case(num_languages, num_models):
+    rng = np.random.default_rng(0)
+    lang = np.repeat([f"l{i}" for i in range(num_languages)], num_models)
+    df = pd.DataFrame({
+        "lang": lang,
+        "model": np.tile([f"model {j}" for j in range(num_models)], num_languages),
+        "score": rng.uniform(20, 95, lang.size),
+        "prompt": rng.choice(PROMPTS, lang.size),
+    })
+    figsize = (max(20, num_languages * num_models * 0.02), 6)
+    return lambda save_path: generate_grouped_prompt_bars(df, figsize=figsize, save_path=save_path)
+
+
+# Benchmark name -> (case factory, sizes passed to it); the first size is the --quick one
+SWEEPS = {
+    "bar_chart": (lambda *size: bar_chart_case(*size, backend="patches"), [(9, 4), (50, 12), (300, 40)]),
+    "bar_chart_collection": (lambda *size: bar_chart_case(*size, backend="collection"),
+                             [(9, 4), (50, 12), (300, 40), (1000, 40)]),
+    "heatmap": (heatmap_case, [(20, 20), (100, 100), (600, 600), (2000, 2000)]),
+    "heatmap_batch": (heatmap_batch_case, [(1, 150), (5, 150), (20, 150)]),
+    "radar_chart": (radar_case, [(9, 4), (30, 12), (100, 30)]),
+    "radar_grid": (radar_grid_case, [(4, 9, 4), (20, 9, 6), (60, 9, 6)]),
+    "f1_vs_train_size": (f1_curves_case, [(10,), (1000,), (100_000,)]),
+    "score_curves": (score_curves_case, [(2, 3, 10), (4, 6, 1000), (8, 8, 100_000)]),
+    "grouped_prompt_bars": (grouped_bars_case, [(8, 8), (100, 24), (1000, 12)]),
+}
+
+
+def run_case(benchmark, size, out_dir, formats, trace_memory=False):
+    func = SWEEPS[benchmark][0](*size)
+    save_path = [os.path.join(out_dir, f"{benchmark}.{fmt}") for fmt in formats]
+    with warnings.catch_warnings(), profile(trace_memory) as prof:
+        warnings.simplefilter("ignore")
+        func(save_path)
+    plt.close("all")
+    return {"benchmark": benchmark, "size": "x".join(map(str, size)), **prof.to_dict()}
+
+
+def print_result(result):
+    phases = {record["phase"]: record for record in result["phases"]}
+    seconds = {name: phases[name]["seconds"] if name in phases else float("nan")
+               for name in ("prepare", "artists", "layout", "save")}
+    peaks = [record["peak_mb"] for record in result["phases"] if record["peak_mb"] is not None]
+    peak = f"{max(peaks):.1f}" if peaks else "-"
+    artists = max((record["artists"] for record in result["phases"]), default=0)
+    print(f"{result['benchmark']:<22}  {result['size']:>12}  {seconds['prepare']:>8.3f}  {seconds['artists']:>8.3f}  "
+          f"{seconds['layout']:>8.3f}  {seconds['save']:>8.3f}  {result['total_seconds']:>8.3f}  "
+          f"{peak:>8}  {artists:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the figure functions phase by phase.")
+    parser.add_argument("--only", nargs="+", choices=sorted(SWEEPS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Only run the smallest size of every sweep")
+    parser.add_argument("--formats", nargs="+", default=["png"], help="Output formats to save")
+    parser.add_argument("--memory", action="store_true",
+                        help="Also measure peak memory per phase (tracemalloc makes the timings several times slower)")
+    parser.add_argument("--output", default=None, help="Write all results, with every phase, to this JSON file")
+    args = parser.parse_args(argv)
+
+    out_dir = tempfile.mkdtemp()
+    results = []
+    print(f"{'benchmark':<22}  {'size':>12}  {'prepare':>8}  {'artists':>8}  {'layout':>8}  {'save':>8}  "
+          f"{'total':>8}  {'peak MB':>8}  {'#artists':>8}")
+    for benchmark in args.only or SWEEPS:
+        sizes = SWEEPS[benchmark][1]
+        for size in sizes[:1] if args.quick else sizes:
+            result = run_case(benchmark, size, out_dir, args.formats, args.memory)
+            print_result(result)
+            results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark generate_grouped_prompt_bars on synthetic languages x models grids.
+
+Reports the time to pivot the long-form data, to build the figure and to save it as PNG,
+for grids from the paper's size up to more than 10k annotated bars.
+
+Usage:
+    python benchmarks/bench_grouped_bars.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from visualization_scripts.new_bar_plot import generate_grouped_prompt_bars, grouped_bar_arrays  # noqa: E402
+
+GRIDS = [(8, 8), (100, 24), (400, 32), (1000, 12)]
+PROMPTS = np.array(["Vanilla", "CoT", "Definition", "5 shot + CoT", "Role Play", ""])
+
+
+def synthetic_results(num_languages, num_models, seed=0):
+    rng = np.random.default_rng(seed)
+    lang = np.repeat([f"l{i}" for i in range(num_languages)], num_models)
+    model = np.tile([f"model {j}" for j in range(num_models)], num_languages)
+    return pd.DataFrame({
+        "lang": lang,
+        "model": model,
+        "score": rng.uniform(20, 95, lang.size),
+        "prompt": rng.choice(PROMPTS, lang.size),
+    })
+
+
+def main():
+    out_dir = tempfile.mkdtemp()
+    print(f"{'languages x models':>18}  {'bars':>6}  {'pivot (s)':>9}  {'draw (s)':>8}  {'save (s)':>8}")
+    for num_languages, num_models in GRIDS:
+        df = synthetic_results(num_languages, num_models)
+        figsize = (max(20, num_languages * num_models * 0.02), 6)
+
+        start = time.perf_counter()
+        grouped_bar_arrays(df)
+        pivot = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generate_grouped_prompt_bars(df, figsize=figsize)
+        draw = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plt.savefig(os.path.join(out_dir, "bars.png"), dpi=100)
+        save = time.perf_counter() - start
+        plt.close("all")
+
+        print(f"{f'{num_languages} x {num_models}':>18}  {len(df):>6}  {pivot:>9.3f}  {draw:>8.2f}  {save:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark cold import time and first-figure latency of the plotting package.
+
+Each measurement runs in a fresh interpreter, so it includes everything a figure script
+pays before drawing: interpreter start, imports, font cache lookup and style setup.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "interpreter": "pass",
+    "import package": "import visualization_scripts",
+    "import numpy": "import numpy",
+    "import matplotlib.pyplot": "import matplotlib.pyplot",
+    "import seaborn": "import seaborn",
+    "import pandas": "import pandas",
+    "first bar chart": (
+        "import numpy as np\n"
+        "from visualization_scripts import generate_bar_chart\n"
+        "generate_bar_chart(np.full((3, 2), 60.0), ['a', 'b', 'c'], ['Task-Specific', 'Label-Specific'],"
+        " save_path=os.path.join(tmp, 'bar.png'))"
+    ),
+    "first heatmap": (
+        "from visualization_scripts import generate_heatmap\n"
+        "generate_heatmap(['a', 'b'], ['c', 'd'], {'a': {'c': 1.0}, 'b': {'d': 2.0}},"
+        " save_path=os.path.join(tmp, 'heatmap.png'))"
+    ),
+    "first f1 curve": (
+        "from visualization_scripts import plot_f1_vs_train_size\n"
+        "plot_f1_vs_train_size([10, 20], [1, 2], [1, 2], [1, 2], [1, 2], [1, 2], [1, 2],"
+        " save_path=os.path.join(tmp, 'curve.png'))"
+    ),
+}
+
+PRELUDE = "import os, tempfile\ntmp = tempfile.mkdtemp()\n"
+
+
+def time_case(code, repeat):
+    """Run `code` in `repeat` fresh interpreters and return the wall times in seconds."""
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONPATH=REPO_ROOT)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", PRELUDE + code], check=True, env=env, cwd=REPO_ROOT)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per case")
+    args = parser.parse_args()
+
+    print(f"{'case':<26}  {'min (s)':>8}  {'median (s)':>10}")
+    for name, code in CASES.items():
+        times = time_case(code, args.repeat)
+        print(f"{name:<26}  {min(times):>8.3f}  {statistics.median(times):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Command line entry point for the figure scripts.
+
+Usage:
+    python main.py render figures.json --jobs 4 --cache-dir .figure_cache
+    python main.py live runs/*.jsonl --save-path live_f1.png
+    python main.py results build runs.csv results_store
+    python main.py server serve --jobs 2
+"""
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the paper figures.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("render", add_help=False,
+                          help="Render the figures listed in a manifest (see visualization_scripts.batch_render)")
+    subparsers.add_parser("live", add_help=False,
+                          help="Keep an F1 vs train size plot updated from growing result logs "
+                               "(see visualization_scripts.live_plot)")
+    subparsers.add_parser("results", add_help=False,
+                          help="Build or inspect a results store (see visualization_scripts.results_store)")
+    subparsers.add_parser("server", add_help=False,
+                          help="Run a warm local render server or send figures to it "
+                               "(see visualization_scripts.render_server)")
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command == "render":
+        from visualization_scripts import batch_render
+        return batch_render.main(rest)
+    if args.command == "live":
+        from visualization_scripts import live_plot
+        return live_plot.main(rest)
+    if args.command == "results":
+        from visualization_scripts import results_store
+        return results_store.main(rest)
+    if args.command == "server":
+        from visualization_scripts import render_server
+        return render_server.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
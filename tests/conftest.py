@@ -0,0 +1,4 @@
+import matplotlib
+
+# Tests never open windows; the figure functions end in plt.show()
+matplotlib.use("Agg")
@@ -0,0 +1,20 @@
+import matplotlib.image as mimage
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from visualization_scripts.bar_chart import generate_bar_chart
+
+DATA = np.array([[60.0, 70.0, 65.0], [75.0, 80.0, 50.0]])
+ERRORS = np.stack([np.full(DATA.shape, 2.0), np.full(DATA.shape, 3.0)])
+METHODS = ["Task-Specific a", "Label-Specific b", "Task-Specific c"]
+
+
+@pytest.mark.parametrize("orientation", ["vertical", "horizontal"])
+def test_collection_backend_matches_patches(tmp_path, orientation):
+    significance = np.array([["", "*", ""], ["**", "", ""]], dtype=object)
+    for backend in ("patches", "collection"):
+        generate_bar_chart(DATA, ["d1", "d2"], METHODS, backend=backend, orientation=orientation, errors=ERRORS,
+                           significance=significance, save_path=str(tmp_path / f"{backend}.png"))
+        plt.close("all")
+    np.testing.assert_array_equal(mimage.imread(tmp_path / "patches.png"), mimage.imread(tmp_path / "collection.png"))
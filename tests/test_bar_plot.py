@@ -0,0 +1,35 @@
+import tracemalloc
+
+import numpy as np
+
+from visualization_scripts.bar_plot import curve_statistics
+
+
+def _scores(shape=(2, 3, 40, 6)):
+    rng = np.random.default_rng(0)
+    scores = rng.normal(60, 5, shape)
+    scores[rng.random(shape) < 0.15] = np.nan
+    return scores
+
+
+def test_bootstrap_matches_loop():
+    scores = _scores()
+    mean, lower, upper = curve_statistics(scores, n_boot=200, seed=3, max_bytes=10_000)
+    resamples = np.random.default_rng(3).integers(0, 6, size=(200, 6))
+    for index in np.ndindex(scores.shape[:3]):
+        np.testing.assert_allclose(mean[index], np.nanmean(scores[index]))
+        boot_means = [np.nanmean(scores[index][rows]) if not np.isnan(scores[index][rows]).all() else np.nan
+                      for rows in resamples]
+        np.testing.assert_allclose([lower[index], upper[index]], np.nanpercentile(boot_means, [2.5, 97.5]))
+
+
+def test_bootstrap_stays_within_max_bytes():
+    scores = _scores((4, 6, 200, 10))
+    tracemalloc.start()
+    try:
+        curve_statistics(scores, n_boot=500, max_bytes=4 * 1024 ** 2)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # The budget plus the NaN-filled copies of the input
+    assert peak < 4 * 1024 ** 2 + 3 * scores.nbytes
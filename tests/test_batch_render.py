@@ -0,0 +1,42 @@
+import matplotlib.image as mimage
+import numpy as np
+import pytest
+
+from visualization_scripts.batch_render import render_figure, render_manifest, resolve_specs
+
+CURVES = ["real_zero_shot", "real_few_shot", "real_xlmt", "func_zero_shot", "func_few_shot", "func_xlmt"]
+
+
+def bar_spec(path):
+    return {"name": "bar", "function": "generate_bar_chart", "save_path": str(path),
+            "args": {"data": np.array([[60.0, 70.0], [65.0, 75.0]]), "datasets": ["d1", "d2"],
+                     "methods": ["Task-Specific a", "Label-Specific b"], "title": "t"}}
+
+
+def test_styles_do_not_leak_between_figures(tmp_path):
+    alone = render_figure(bar_spec(tmp_path / "alone.png"))
+    # plot_f1_vs_train_size calls sns.set() globally
+    curve = render_figure({"name": "curve", "function": "plot_f1_vs_train_size", "save_path": str(tmp_path / "f1.png"),
+                           "args": {"train_sizes": [10, 20, 30], **{name: [30, 40, 50] for name in CURVES}}})
+    after = render_figure(bar_spec(tmp_path / "after.png"))
+    assert [alone["status"], curve["status"], after["status"]] == ["ok"] * 3
+    np.testing.assert_array_equal(mimage.imread(tmp_path / "alone.png"), mimage.imread(tmp_path / "after.png"))
+
+
+def test_failures_are_reported(tmp_path):
+    result = render_figure({"name": "bad", "function": "generate_heatmap", "args": {},
+                            "save_path": str(tmp_path / "bad.png")})
+    assert result["status"] == "failed" and "TypeError" in result["error"]
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    specs = [dict(bar_spec("a.png"), name="x"), dict(bar_spec("b.png"), name="x")]
+    with pytest.raises(ValueError, match="duplicate name 'x'"):
+        resolve_specs(specs, str(tmp_path))
+
+
+def test_results_follow_manifest_order(tmp_path):
+    figures = [bar_spec(tmp_path / "a.png"),
+               {"name": "bad", "function": "generate_heatmap", "args": {}, "save_path": str(tmp_path / "bad.png")}]
+    results = render_manifest(resolve_specs(figures, str(tmp_path)), jobs=1)
+    assert [(r["name"], r["status"]) for r in results] == [("bar", "ok"), ("bad", "failed")]
@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+
+from visualization_scripts.downsample import lttb_indices
+
+
+def _reference_lttb(x, y, n_out):
+    """The original per-point LTTB loop (Steinarsson, 2013)."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        avg_start, avg_end = math.floor((i + 1) * every) + 1, min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+
+def test_matches_reference_loop():
+    rng = np.random.default_rng(0)
+    for n, n_out in [(10, 3), (100, 7), (1000, 100), (1234, 567)]:
+        x = np.sort(rng.uniform(0, 100, n))
+        y = np.cumsum(rng.normal(size=n))
+        assert list(lttb_indices(x, y, n_out)) == _reference_lttb(list(x), list(y), n_out)
+
+
+def test_keeps_peaks_and_small_inputs():
+    y = np.zeros(1000)
+    y[501] = 10
+    assert 501 in lttb_indices(np.arange(1000), y, 20)
+    assert list(lttb_indices([1, 2, 3], [1, 2, 3], 10)) == [0, 1, 2]
@@ -0,0 +1,39 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import image, rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from visualization_scripts.export import _snap_to_pixels, export_figure, format_report
+
+
+def _figure():
+    fig = plt.figure(figsize=(4.37, 3.21))
+    ax = fig.add_subplot(projection="polar")
+    ax.plot(np.linspace(0, 2 * np.pi, 50), np.linspace(1, 2, 50))
+    ax.set_title("Radar")
+    return fig
+
+
+def test_png_matches_savefig_with_the_exported_box(tmp_path):
+    fig = _figure()
+    export_figure(fig, [tmp_path / "a.png", tmp_path / "a.tif"], dpi=137)
+    canvas = FigureCanvasAgg(fig)
+    fig.dpi = 137
+    canvas.draw()
+    box = _snap_to_pixels(fig.get_tightbbox(canvas.get_renderer()).padded(rcParams["savefig.pad_inches"]), 137,
+                          canvas.get_width_height(physical=True)[1])
+    fig.savefig(tmp_path / "b.png", dpi=137, bbox_inches=box)
+    np.testing.assert_array_equal(image.imread(tmp_path / "a.png"), image.imread(tmp_path / "b.png"))
+    # Raster formats other than PNG go through savefig
+    assert image.imread(tmp_path / "a.tif").shape[:2] == image.imread(tmp_path / "a.png").shape[:2]
+    plt.close("all")
+
+
+def test_report_separates_draw_and_encode_times(tmp_path):
+    fig = _figure()
+    report = export_figure(fig, [tmp_path / "a.png", tmp_path / "a.jpg", tmp_path / "a.svg"], dpi=100, jobs=1)
+    png, jpg, svg = report
+    assert png["draw_seconds"] == jpg["draw_seconds"] > 0 and svg["draw_seconds"] == 0
+    assert png["seconds"] > 0 and jpg["seconds"] > 0 and svg["seconds"] > 0
+    assert len(format_report(report).splitlines()) == 4
+    plt.close("all")
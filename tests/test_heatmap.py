@@ -0,0 +1,100 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from visualization_scripts.heatmap import (HeatmapPyramid, build_heatmap_pyramid, build_relation_matrix,
+                                          generate_heatmap)
+
+
+def test_string_labels_and_coo_positions():
+    matrix, mask = build_relation_matrix(["a", "b"], ["x", "y"], ([0, 1], [1, 0], [3.0, 4.0]))
+    np.testing.assert_array_equal(matrix, [[0, 3], [4, 0]])
+    np.testing.assert_array_equal(mask, [[False, True], [True, False]])
+
+
+def test_integer_labels_are_looked_up_as_labels():
+    expected = [[5, 0], [0, 0], [0, 1]]
+    for sources in ([10, 20, 30], [1, 2, 3]):
+        relations = {sources[0]: {1: 5.0}, sources[2]: {2: 1.0}}
+        np.testing.assert_array_equal(build_relation_matrix(sources, [1, 2], relations)[0], expected)
+        coo = ([sources[0], sources[2]], [1, 2], [5.0, 1.0])
+        np.testing.assert_array_equal(build_relation_matrix(sources, [1, 2], coo)[0], expected)
+    frame = pd.DataFrame({"source": [3], "target": [1], "score": [7.0]})
+    np.testing.assert_array_equal(build_relation_matrix([1, 2, 3], [1, 2], frame)[0], [[0, 0], [0, 0], [7, 0]])
+
+
+def test_unknown_labels_are_ignored():
+    matrix, mask = build_relation_matrix(["a"], ["x"], {"a": {"x": 1.0, "z": 2.0}, "q": {"x": 3.0}})
+    np.testing.assert_array_equal(matrix, [[1.0]])
+    assert mask.sum() == 1
+
+
+def _hierarchical_relations():
+    rng = np.random.default_rng(0)
+    sources = [f"d{a} - g{b} - s{c}" for a in range(3) for b in range(2) for c in range(rng.integers(1, 4))]
+    targets = [f"d{a} - g{b} - t{c}" for a in range(2) for b in range(3) for c in range(2)] + ["flat"]
+    pairs = rng.random((len(sources), len(targets))) < 0.4
+    rows, cols = np.nonzero(pairs)
+    frame = pd.DataFrame({"source": np.array(sources)[rows], "target": np.array(targets)[cols],
+                          "score": rng.uniform(-1, 1, len(rows))})
+    return sources, targets, frame
+
+
+def _prefix(labels, level):
+    return labels.str.split(" - ").str[:level].str.join(" - ")
+
+
+def test_pyramid_select_matches_groupby(tmp_path):
+    sources, targets, frame = _hierarchical_relations()
+    pyramid = build_heatmap_pyramid(sources, targets, frame)
+    pyramid.save(tmp_path / "pyramid.npz")
+    for pyramid in (pyramid, HeatmapPyramid.load(tmp_path / "pyramid.npz")):
+        for level in (1, 2, 3):
+            grouped = frame.groupby([_prefix(frame.source, level), _prefix(frame.target, level)]).score
+            for agg in ("mean", "sum", "max"):
+                matrix, mask, row_labels, col_labels = pyramid.select(level, agg)
+                expected = grouped.agg(agg).unstack().reindex(index=row_labels, columns=col_labels)
+                np.testing.assert_array_equal(mask, expected.notna().to_numpy())
+                np.testing.assert_allclose(matrix, expected.fillna(0).to_numpy())
+
+
+def test_pyramid_drill_down():
+    sources, targets, frame = _hierarchical_relations()
+    matrix, mask, row_labels, col_labels = build_heatmap_pyramid(sources, targets, frame).select(
+        3, "sum", row_prefix="d1", col_prefix="d0 - g2")
+    assert row_labels == sorted(label for label in sources if label.startswith("d1 - "))
+    assert col_labels == ["d0 - g2 - t0", "d0 - g2 - t1"]
+    selected = frame[frame.source.isin(row_labels) & frame.target.isin(col_labels)]
+    assert np.isclose(matrix.sum(), selected.score.sum()) and mask.sum() == len(selected)
+
+
+def _cell_texts(ax):
+    return sorted(float(text.get_text()) for text in ax.texts if text.get_text())
+
+
+def test_lod_bounds_artists_and_annotates_top_cells():
+    rng = np.random.default_rng(0)
+    labels = [f"l{i}" for i in range(120)]
+    values = rng.permutation(labels.__len__() ** 2) / 100
+    relations = (np.repeat(np.arange(120), 120), np.tile(np.arange(120), 120), values)
+    generate_heatmap(labels, labels, relations, annot_top_k=50, dpi=100)
+    ax = plt.gca()
+    # One image and at most two line collections for the grid, no per-cell artists
+    assert len(ax.images) == 1 and len(ax.collections) <= 2 and not ax.patches
+    assert _cell_texts(ax) == sorted(np.sort(values)[-50:])
+    assert len(ax.get_children()) < 100 and len(ax.get_yticklabels()) < 120
+    plt.close("all")
+
+    generate_heatmap(labels, labels, relations, annot_top_k=None, annot_threshold=140, dpi=100)
+    assert _cell_texts(plt.gca()) == sorted(values[values >= 140])
+    plt.close("all")
+
+
+def test_small_heatmaps_keep_seaborn_and_many_annotations_switch_to_lod():
+    relations = {"a": {"x": 1.0, "y": 2.0}, "b": {"x": 3.0}}
+    generate_heatmap(["a", "b"], ["x", "y"], relations)
+    assert not plt.gca().images and _cell_texts(plt.gca()) == [1.0, 2.0, 3.0]
+    plt.close("all")
+    generate_heatmap(["a", "b"], ["x", "y"], relations, annot_top_k=2)
+    assert len(plt.gca().images) == 1 and _cell_texts(plt.gca()) == [2.0, 3.0]
+    plt.close("all")
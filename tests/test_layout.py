@@ -0,0 +1,27 @@
+import matplotlib
+import matplotlib.pyplot as plt
+
+from visualization_scripts.layout import disable_text_cache, enable_text_cache, text_extents
+
+
+def _width(family):
+    with matplotlib.rc_context({"font.family": "sans-serif", "font.sans-serif": [family]}):
+        fig = plt.figure()
+        text = fig.text(0, 0, "The quick brown fox jumps")
+        width = text.get_window_extent(fig.canvas.get_renderer()).width
+        plt.close(fig)
+    return width
+
+
+def test_text_cache_follows_font_family_changes():
+    disable_text_cache()
+    expected = [_width("DejaVu Sans"), _width("DejaVu Serif")]
+    assert expected[0] != expected[1]
+    enable_text_cache()
+    try:
+        text_extents.clear()
+        assert [_width("DejaVu Sans"), _width("DejaVu Serif")] == expected
+        assert [_width("DejaVu Sans"), _width("DejaVu Serif")] == expected
+        assert text_extents.hits >= 2
+    finally:
+        disable_text_cache()
@@ -0,0 +1,43 @@
+import json
+
+from visualization_scripts.live_plot import LiveF1Plot, LogTail
+
+
+def test_log_tail_reads_in_chunks_and_skips_corrupt_lines(tmp_path):
+    path = tmp_path / "run.jsonl"
+    lines = [json.dumps({"series": "a", "train_size": i, "f1": 50}) for i in range(100)]
+    path.write_text("\n".join(lines[:50] + ["{not json", "[1, 2]"] + lines[50:]) + "\n" + lines[0][:10])
+    tail = LogTail(str(path), chunk_bytes=256)
+    chunks = list(tail.read_chunks())
+    assert len(chunks) > 1
+    assert [record["train_size"] for records in chunks for record in records] == list(range(100))
+    # The trailing partial line is completed by the next write
+    with open(path, "a") as f:
+        f.write(lines[0][10:] + "\n")
+    assert tail.read_records() == [json.loads(lines[0])]
+
+
+def test_poll_skips_records_without_series(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text('{"train_size": 10, "f1": 50}\n{"series": "a", "train_size": 20, "f1": 60}\nnot json\n')
+    plot = LiveF1Plot([str(path)], str(tmp_path / "live.png"))
+    assert plot.poll() == 1
+    assert list(plot.series["a"].data()[0]) == [20]
+    assert plot.render(force=True)
+
+
+def test_points_within_min_interval_are_written_later(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text('{"series": "a", "train_size": 10, "f1": 50}\n')
+    plot = LiveF1Plot([str(path)], str(tmp_path / "live.png"), min_interval=1.0)
+    plot.poll()
+    assert plot.render() and not plot.dirty
+    with open(path, "a") as f:
+        f.write('{"series": "a", "train_size": 20, "f1": 60}\n')
+    plot.poll()
+    assert not plot.render() and plot.dirty  # Rate limited
+    writes = []
+    plot._write_buffer = lambda path, write=plot._write_buffer: writes.append(write(path))
+    plot.follow(poll_interval=0.05, duration=1.5)
+    # Once by the loop when the interval has passed, once more on exit
+    assert len(writes) == 2 and not plot.dirty
@@ -0,0 +1,39 @@
+import pickle
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from visualization_scripts.layout import default_engine
+from visualization_scripts.new_bar_plot import BarAnnotations, generate_grouped_prompt_bars
+
+
+def _scores(prompt="p1"):
+    return pd.DataFrame({"lang": ["en", "en", "de", "de"], "model": ["a", "b", "a", "b"],
+                         "score": [50.0, 60.0, 70.0, 80.0], "prompt": [prompt] * 4})
+
+
+def test_grouped_bars_can_be_pickled():
+    generate_grouped_prompt_bars(_scores())
+    fig = plt.gcf()
+    annotations = [child for child in fig.axes[0].get_children() if isinstance(child, BarAnnotations)]
+    assert len(annotations) == 1 and len(annotations[0]) == 4
+    copy = pickle.loads(pickle.dumps(fig))
+    copy.canvas.draw()
+    plt.close("all")
+
+
+def test_long_prompts_get_their_own_margins():
+    long_prompts = _scores("a much longer prompt that sticks out far above the bars")
+    default_engine.clear()
+    generate_grouped_prompt_bars(long_prompts)
+    fresh_top = plt.gcf().subplotpars.top
+    plt.close("all")
+
+    default_engine.clear()
+    generate_grouped_prompt_bars(_scores("short"))
+    plt.close("all")
+    generate_grouped_prompt_bars(long_prompts)
+    assert np.isclose(plt.gcf().subplotpars.top, fresh_top)
+    assert default_engine.misses == 2
+    plt.close("all")
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from visualization_scripts.bar_plot import plot_f1_vs_train_size
+from visualization_scripts.new_bar_plot import generate_grouped_prompt_bars
+from visualization_scripts.render_cache import RenderCache, _code_files
+
+CURVES = {name: [30, 40, 50] for name in
+          ["real_zero_shot", "real_few_shot", "real_xlmt", "func_zero_shot", "func_few_shot", "func_xlmt"]}
+
+
+def test_code_version_covers_shared_modules():
+    names = {os.path.basename(path) for path in _code_files(generate_grouped_prompt_bars)}
+    assert {"new_bar_plot.py", "bar_chart.py", "export.py", "layout.py", "downsample.py"} <= names
+
+
+def test_hits_and_stable_keys(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    cached = cache.wrap(plot_f1_vs_train_size)
+    arguments = {"train_sizes": [10, 20, 30], **CURVES}
+    key_before = cache.key(plot_f1_vs_train_size, arguments)
+    cached([10, 20, 30], **CURVES, save_path=str(tmp_path / "a.png"))
+    # The function calls sns.set(); the rcParams the next key is taken from must not change
+    assert cache.key(plot_f1_vs_train_size, arguments) == key_before
+    cached([10, 20, 30], **CURVES, save_path=str(tmp_path / "b.png"))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert open(tmp_path / "a.png", "rb").read() == open(tmp_path / "b.png", "rb").read()
+    cached(np.array([10, 20, 30]), **{**CURVES, "func_xlmt": [1, 2, 3]}, save_path=str(tmp_path / "c.png"))
+    assert cache.misses == 2
+
+
+def test_objects_are_hashed_by_content(tmp_path):
+    import matplotlib
+
+    from visualization_scripts.heatmap import build_heatmap_pyramid, generate_heatmap
+
+    cache = RenderCache(tmp_path / "cache")
+    relations = {"a - x": {"b - y": 1.0}, "a - z": {"b - y": 2.0}}
+
+    def key(**arguments):
+        return cache.key(generate_heatmap, {"source_labels": None, **arguments})
+
+    pyramids = [build_heatmap_pyramid(["a - x", "a - z"], ["b - y"], relations) for _ in range(2)]
+    assert key(pyramid=pyramids[0]) == key(pyramid=pyramids[1])
+    other = build_heatmap_pyramid(["a - x", "a - z"], ["b - y"], {"a - x": {"b - y": 3.0}})
+    assert key(pyramid=pyramids[0]) != key(pyramid=other)
+    blues, reds = matplotlib.colormaps["Blues"], matplotlib.colormaps["Reds"]
+    assert key(cmap=blues) == key(cmap=blues.copy()) != key(cmap=reds)
+    with pytest.raises(TypeError):
+        key(cmap=object())
+
+
+def test_unhashable_arguments_render_uncached(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    cached = cache.wrap(plot_f1_vs_train_size)
+    for name in ("a.png", "b.png"):
+        cached([10, 20, 30], **CURVES, title=object(), save_path=str(tmp_path / name))
+    assert (cache.hits, cache.misses, cache.uncached) == (0, 0, 2)
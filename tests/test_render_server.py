@@ -0,0 +1,22 @@
+import threading
+
+from visualization_scripts.render_server import RenderServer, render_remote, server_status
+
+
+def test_requests_larger_than_max_pending_are_queued(tmp_path):
+    server = RenderServer(("127.0.0.1", 0), jobs=1, max_pending=1)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    url = "http://%s:%d" % server.server_address
+    try:
+        figures = [{"name": f"bar{i}", "function": "generate_bar_chart", "save_path": f"bar{i}.png",
+                    "args": {"data": [[60.0, 70.0]], "datasets": ["d"], "methods": ["a", "b"]}} for i in range(3)]
+        results = render_remote(figures, url, base_dir=tmp_path)
+        assert [r["status"] for r in results] == ["ok"] * 3
+        assert all((tmp_path / f"bar{i}.png").exists() for i in range(3))
+        status = server_status(url)
+        assert (status["rendered"], status["pending"]) == (3, 0)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from visualization_scripts.results_store import ResultsStore, main
+
+
+def _runs():
+    rng = np.random.default_rng(0)
+    size = 500
+    return pd.DataFrame({
+        "dataset": rng.choice(["sst2", "imdb", "yelp"], size),
+        "method": rng.choice(["zero_shot", "few_shot", "xlmt", "bert"], size),
+        "prompt": rng.choice(["base", "cot", "short"], size),
+        "seed": rng.integers(0, 5, size),
+        "f1": rng.uniform(20, 90, size),
+    })
+
+
+def test_array_matches_groupby(tmp_path):
+    df = _runs()
+    store = ResultsStore.write(str(tmp_path / "store"), df)
+    methods = ["xlmt", "bert", "missing"]
+    for agg in ("mean", "sum", "min", "max", "count"):
+        scores, (datasets, found) = store.array(["dataset", "method"], "f1", agg=agg, prompt="cot", method=methods)
+        assert found == ["xlmt", "bert"]
+        expected = (df[(df.prompt == "cot") & df.method.isin(methods)].groupby(["dataset", "method"]).f1.agg(agg)
+                    .unstack().reindex(index=datasets, columns=found))
+        np.testing.assert_allclose(scores, expected.to_numpy(dtype=float))
+
+
+def test_query_matches_pandas_filter(tmp_path):
+    df = _runs()
+    store = ResultsStore.write(str(tmp_path / "store"), df)
+    result = store.to_frame(["dataset", "seed", "f1"], method=["bert", "few_shot"], seed=[1, 3])
+    expected = df[df.method.isin(["bert", "few_shot"]) & df.seed.isin([1, 3])]
+    assert len(result) == len(expected)
+    assert np.isclose(result.f1.sum(), expected.f1.sum())
+    assert set(result.seed) == {1, 3}
+    assert len(store.query(dataset="unknown")["f1"]) == 0
+
+
+def test_build_with_missing_prompts(tmp_path):
+    df = _runs()
+    df.loc[::7, "prompt"] = np.nan
+    df.to_csv(tmp_path / "runs.csv", index=False)
+    main(["build", str(tmp_path / "runs.csv"), str(tmp_path / "store")])
+    store = ResultsStore(str(tmp_path / "store"))
+    assert len(store.query(prompt="")["f1"]) == df.prompt.isna().sum()
+    assert store.labels("prompt") == ["", "base", "cot", "short"]
@@ -0,0 +1,87 @@
+import tracemalloc
+
+import numpy as np
+
+from visualization_scripts.significance import compare_methods, interval_errors, significance_markers
+
+RESAMPLES = 200
+
+
+def _f1_macro(predictions, gold):
+    classes = np.unique(np.concatenate([predictions, gold]))
+    return 100 * np.mean([2 * ((predictions == c) & (gold == c)).sum() / ((predictions == c).sum() + (gold == c).sum())
+                          for c in classes])
+
+
+def _predictions(num_datasets=2, num_examples=200):
+    rng = np.random.default_rng(0)
+    gold = [rng.integers(0, 3, num_examples) for _ in range(num_datasets)]
+    predictions = [np.array([np.where(rng.random(num_examples) < accuracy, labels, rng.integers(0, 3, num_examples))
+                             for accuracy in (0.6, 0.62, 0.75)]) for labels in gold]
+    return predictions, gold
+
+
+def test_scores_and_bootstrap_match_loops():
+    predictions, gold = _predictions()
+    result = compare_methods(predictions, gold, n_resamples=RESAMPLES, max_bytes=10 ** 9)
+    np.testing.assert_allclose(result["score"], [[_f1_macro(p, g) for p in dataset] for dataset, g in
+                                                 zip(predictions, gold)])
+    # The first dataset draws from the first spawned stream, all resamples in one chunk
+    draws = np.random.default_rng(np.random.SeedSequence(0).spawn(2)[0]).integers(0, 200, size=(RESAMPLES, 200))
+    samples = np.array([[_f1_macro(p[rows], gold[0][rows]) for p in predictions[0]] for rows in draws])
+    lower, upper = np.percentile(samples, [2.5, 97.5], axis=0)
+    np.testing.assert_allclose(result["lower"][0], lower)
+    np.testing.assert_allclose(result["upper"][0], upper)
+    observed = result["score"][0, 0] - result["score"][0, 2]
+    exceed = (np.abs(samples[:, 0] - samples[:, 2] - observed) >= abs(observed) - 1e-12).sum()
+    assert np.isclose(result["p_values"][0, 0, 2], (1 + exceed) / (RESAMPLES + 1))
+    assert np.isclose(result["p_values"][0, 2, 0], result["p_values"][0, 0, 2])
+    assert np.isnan(result["p_values"][0, 1, 1])
+
+
+def test_permutation_matches_loop():
+    predictions, gold = _predictions(num_datasets=1)
+    result = compare_methods(predictions, gold, test="permutation", n_resamples=RESAMPLES, ci=None)
+    swaps = np.random.default_rng(np.random.SeedSequence(0).spawn(1)[0]).integers(0, 2, size=(RESAMPLES, 200))
+    first, second = predictions[0][0], predictions[0][2]
+    observed = abs(result["score"][0, 0] - result["score"][0, 2])
+    exceed = sum(abs(_f1_macro(np.where(swap, second, first), gold[0])
+                     - _f1_macro(np.where(swap, first, second), gold[0])) >= observed - 1e-12
+                 for swap in swaps.astype(bool))
+    assert np.isclose(result["p_values"][0, 0, 2], (1 + exceed) / (RESAMPLES + 1))
+    assert np.isnan(result["lower"]).all()
+
+
+def test_jobs_and_chunking_do_not_change_results():
+    predictions, gold = _predictions(num_datasets=3)
+    reference = compare_methods(predictions, gold, n_resamples=RESAMPLES)
+    for kwargs in ({"jobs": 2}, {"max_bytes": 50_000}):
+        result = compare_methods(predictions, gold, n_resamples=RESAMPLES, **kwargs)
+        for key in ("score", "lower", "upper", "p_values"):
+            np.testing.assert_array_equal(result[key], reference[key])
+
+
+def test_seed_scores_and_markers():
+    scores = np.array([[[60.0, 61, 59, 60, 62], [70, 71, 69, 70, np.nan], [60, 60, 61, 59, 60]]])
+    result = compare_methods(scores=scores, n_resamples=RESAMPLES)
+    # The fifth seed is missing for one method, so it is dropped for all
+    np.testing.assert_allclose(result["score"][0], [60, 70, 60])
+    markers = significance_markers(result["p_values"], result["score"], reference=0)
+    assert markers[0, 0] == "" and markers[0, 2] == "" and markers[0, 1].startswith("*")
+    errors = interval_errors(result["score"], result["lower"], result["upper"])
+    assert errors.shape == (2, 1, 3) and (errors >= 0).all()
+
+
+def test_resample_chunks_stay_within_max_bytes():
+    predictions, gold = _predictions(num_datasets=1, num_examples=50_000)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for max_bytes in (1, 8 * 1024 ** 2):
+            tracemalloc.reset_peak()
+            compare_methods(predictions, gold, n_resamples=100, max_bytes=max_bytes)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    # One resample per chunk needs next to nothing, so the difference is the chunks' share
+    assert peaks[1] - peaks[0] <= 8 * 1024 ** 2
@@ -0,0 +1,39 @@
+"""
+Plotting functions for the paper figures.
+
+Importing the package has no side effects: the figure functions are only imported from
+their modules on first access, and matplotlib, seaborn and pandas are only imported once
+a function that draws or reshapes data is called.
+"""
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "generate_bar_chart": "bar_chart",
+    "plot_f1_vs_train_size": "bar_plot",
+    "plot_score_curves": "bar_plot",
+    "build_relation_matrix": "heatmap",
+    "generate_heatmap": "heatmap",
+    "build_heatmap_pyramid": "heatmap",
+    "HeatmapPyramid": "heatmap",
+    "generate_radar_chart": "radar_chart",
+    "generate_radar_grid": "radar_chart",
+    "RenderCache": "render_cache",
+    "LayoutEngine": "layout",
+    "ResultsStore": "results_store",
+    "compare_methods": "significance",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,162 @@
+import numpy as np
+
+from .export import save_figure
+from .layout import tight_layout
+from .profiling import phase
+
+
+def bar_collection(positions, lengths, width, colors, orientation="vertical", base=0.0):
+    """
+    Build one PolyCollection holding a whole set of bars, instead of one Rectangle per bar.
+
+    Parameters:
+    - positions: 1D array of bar centres along the category axis
+    - lengths: 1D array of bar lengths along the value axis
+    - width: Bar width along the category axis
+    - colors: A single color or one color per bar
+    - orientation: "vertical" (bars grow along y) or "horizontal" (bars grow along x)
+    - base: Value the bars start from
+    """
+    from matplotlib.collections import PolyCollection
+
+    positions = np.asarray(positions, dtype=float)
+    ends = base + np.asarray(lengths, dtype=float)
+    starts = np.full_like(ends, base)
+    low, high = positions - width / 2, positions + width / 2
+    category = np.column_stack([low, high, high, low])
+    value = np.column_stack([starts, starts, ends, ends])
+    if orientation == "horizontal":
+        category, value = value, category
+    return PolyCollection(np.stack([category, value], axis=-1), facecolors=colors, edgecolors="none")
+
+
+def generate_bar_chart(data, datasets, methods, title="Comparison of Settings Across Datasets",
+                       colors=None, save_path=None, backend="patches", orientation="vertical", errors=None,
+                       significance=None):
+    """
+    Generate a grouped bar chart for F1-macro scores across datasets.
+
+    Parameters:
+    - data: 2D numpy array of shape (num_datasets, num_methods)
+    - datasets: List of dataset names
+    - methods: List of method names (settings)
+    - title: Chart title
+    - colors: Custom color list, one per method (optional)
+    - save_path: Path to save the figure, or a list of paths to write several formats (optional)
+    - backend: "patches" draws one bar() call per method; "collection" draws all bars as a single
+      PolyCollection with legend proxies, which is much faster for large data matrices
+    - orientation: "vertical" or "horizontal" bars
+    - errors: Error bar sizes, shaped like data, or (2, num_datasets, num_methods) for
+      asymmetric lower/upper errors (optional, see significance.interval_errors)
+    - significance: Markers such as "*" drawn past the end of each bar, shaped like data, with
+      "" for no marker (optional, see significance.significance_markers)
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as mcolors
+    import matplotlib.patches as mpatches
+
+    with phase("prepare"):
+        num_datasets = len(datasets)
+        num_methods = len(methods)
+        x = np.arange(num_datasets)
+        width = 0.8 / num_methods  # Adjust width to fit bars neatly with space
+        spacing = 0.02  # Small space between groups
+        horizontal = orientation == "horizontal"
+
+        if colors is None:
+            # Define color scheme using tab20c colormap
+            cmap = plt.get_cmap("tab20c")
+            task_colors = [cmap(2), cmap(0), cmap(1)]  # Different shades of blue
+            label_colors = [cmap(5), cmap(6), cmap(4)]  # Different shades of orange
+
+            colors = []
+            for i in range(num_methods):
+                if "Label-Specific" in methods[i]:
+                    colors.append(label_colors[i % len(label_colors)])
+                else:
+                    colors.append(task_colors[i % len(task_colors)])
+
+    with phase("artists"):
+        plt.figure(figsize=(12, 6))
+        ax = plt.gca()
+        positions = x[:, None] + np.arange(num_methods)[None, :] * width  # (num_datasets, num_methods)
+        if backend == "collection":
+            bar_colors = np.tile(mcolors.to_rgba_array(colors), (num_datasets, 1))
+            ax.add_collection(bar_collection(positions.ravel(), data.ravel(), width, bar_colors, orientation))
+            ax.autoscale_view()
+            handles = [mpatches.Patch(facecolor=color, linewidth=0, label=method) for method, color in zip(methods, colors)]
+        else:
+            draw_bar = plt.barh if horizontal else plt.bar
+            for i, method in enumerate(methods):
+                draw_bar(positions[:, i], data[:, i], width, label=method, color=colors[i])
+            handles = None
+
+        ends = data.ravel()
+        if errors is not None:
+            errors = np.asarray(errors)
+            errors = errors.reshape(2, -1) if errors.ndim == 3 else errors.ravel()
+            error_kwargs = dict(fmt="none", ecolor="black", elinewidth=1, capsize=2)
+            if horizontal:
+                ax.errorbar(data.ravel(), positions.ravel(), xerr=errors, **error_kwargs)
+            else:
+                ax.errorbar(positions.ravel(), data.ravel(), yerr=errors, **error_kwargs)
+            ends = ends + np.nan_to_num(errors[1] if errors.ndim == 2 else errors)
+
+        if significance is not None:
+            # Markers sit just past the end of the bar (or of its error bar), a few points away
+            markers = np.asarray(significance, dtype=object).ravel()
+            for i in np.flatnonzero(markers != ""):
+                if horizontal:
+                    ax.annotate(markers[i], (ends[i], positions.flat[i]), xytext=(3, 0), textcoords="offset points",
+                                ha="left", va="center", fontsize=9)
+                else:
+                    ax.annotate(markers[i], (positions.flat[i], ends[i]), xytext=(0, 1), textcoords="offset points",
+                                ha="center", va="bottom", fontsize=9)
+
+        value_limits = (30, max(data.max() + 5, 100))
+        if horizontal:
+            plt.yticks(x + width * num_methods / 2, datasets, fontsize=12)
+            plt.xlim(*value_limits)
+            plt.xlabel("F1-Macro Score", fontsize=12)
+        else:
+            plt.xticks(x + width * num_methods / 2, datasets, rotation=45, fontsize=12)
+            plt.ylim(*value_limits)
+            plt.ylabel("F1-Macro Score", fontsize=12)
+
+        # Improve legend placement and avoid overlap
+        plt.legend(handles=handles, ncol=3, fontsize="small", loc="upper center", bbox_to_anchor=(0.5, -0.4),
+                   frameon=True)
+        plt.grid(axis="x" if horizontal else "y", linestyle="--", alpha=0.6)
+
+    with phase("layout"):
+        tight_layout()
+
+    if save_path:
+        with phase("save"):
+            save_figure(save_path, dpi=300)
+    plt.show()
+
+
+# Example Usage
+if __name__ == "__main__":
+    datasets_2 = ["GermEval18 (binary)", "SRW16 (binary)", "HateSpeech18", "HASOC (de - binary)", "OLID (targeted)", "OLID (target)", "average"]
+    scores = np.array([
+        [62.67, 70.98, 65.78, 71.38, 70.58, 70.75],
+        [83.11, 85.27, 84.04, 86.69, 85.69, 86.80],
+        [73.58, 76.43, 73.71, 78.21, 76.62, 77.03],
+        [52.95, 53.30, 50.19, 51.92, 53.23, 53.57],
+        [47.02, 61.47, 59.80, 63.91, 55.75, 67.71],
+        [54.68, 57.51, 54.81, 59.40, 48.96, 56.73],
+        [57.11, 61.32, 59.98, 61.95, 60.45, 62.51]
+    ])
+
+    methods = [
+        "Task-Specific Source SFT",
+        "Label-Specific Source SFT",
+        "Task-Specific Target SFT with Initialization",
+        "Label-Specific Target SFT with Initialization",
+        "Task-Specific Target SFT with Attention",
+        "Label-Specific Target SFT with Attention",
+    ]
+
+    generate_bar_chart(scores, datasets_2, methods)
\ No newline at end of file
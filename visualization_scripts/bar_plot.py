@@ -0,0 +1,244 @@
+import warnings
+
+import numpy as np
+
+from .export import save_figure
+from .layout import tight_layout
+from .profiling import phase
+
+# Line style of each series, shared by plot_f1_vs_train_size and the live mode in live_plot.py
+SERIES_STYLES = {
+    # Real group - blue
+    'Real: Zero-Shot': dict(linestyle='--', linewidth=2, color='tab:blue'),
+    'Real: Few-Shot': dict(linestyle='-.', linewidth=2, color='tab:blue'),
+    'Real: XLM-T': dict(linestyle='-', marker='o', linewidth=2, color='tab:blue'),
+    # Functional group - orange
+    'Func: Zero-Shot': dict(linestyle='--', linewidth=2, color='tab:orange'),
+    'Func: Few-Shot': dict(linestyle='-.', linewidth=2, color='tab:orange'),
+    'Func: XLM-T': dict(linestyle='-', marker='s', linewidth=2, color='tab:orange'),
+}
+
+
+def plot_f1_vs_train_size(
+    train_sizes,
+    real_zero_shot,
+    real_few_shot,
+    real_xlmt,
+    func_zero_shot,
+    func_few_shot,
+    func_xlmt,
+    title="F1-Macro vs Train Size",
+    ylabel="Macro F1",
+    xlabel="Train Size",
+    ylim=(20, 90),
+    save_path=None
+):
+    """
+    Plots F1-macro vs training size for two test groups with zero-shot, few-shot, and XLM-T results.
+
+    Parameters:
+        train_sizes (list): X-axis values (training sizes).
+        real_zero_shot, real_few_shot, real_xlmt (list): Real group performance.
+        func_zero_shot, func_few_shot, func_xlmt (list): Functional group performance.
+        title, xlabel, ylabel (str): Axis labels and plot title.
+        ylim (tuple): Y-axis limits.
+        save_path (str or list): Path(s) to save the plot image (e.g. "plot.png" or ["plot.png", "plot.pdf"]). If None, just displays.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    with phase("artists"):
+        sns.set(style="darkgrid", context="paper", palette="muted", font_scale=1.2)
+        plt.figure(figsize=(10, 6))
+
+        # Real group - blue
+        sns.lineplot(x=train_sizes, y=real_zero_shot, label='Real: Zero-Shot', **SERIES_STYLES['Real: Zero-Shot'])
+        sns.lineplot(x=train_sizes, y=real_few_shot, label='Real: Few-Shot', **SERIES_STYLES['Real: Few-Shot'])
+        sns.lineplot(x=train_sizes, y=real_xlmt, label='Real: XLM-T', **SERIES_STYLES['Real: XLM-T'])
+
+        # Functional group - orange
+        sns.lineplot(x=train_sizes, y=func_zero_shot, label='Func: Zero-Shot', **SERIES_STYLES['Func: Zero-Shot'])
+        sns.lineplot(x=train_sizes, y=func_few_shot, label='Func: Few-Shot', **SERIES_STYLES['Func: Few-Shot'])
+        sns.lineplot(x=train_sizes, y=func_xlmt, label='Func: XLM-T', **SERIES_STYLES['Func: XLM-T'])
+
+        plt.title(title, fontsize=14)
+        plt.xlabel(xlabel)
+        plt.ylabel(ylabel)
+        plt.xlim(0, max(train_sizes) + 100)
+        plt.ylim(*ylim)
+        plt.legend(title='Model', fontsize=10)
+
+    with phase("layout"):
+        tight_layout()
+
+    if save_path:
+        with phase("save"):
+            save_figure(save_path, dpi=300, bbox_inches=None)
+    else:
+        plt.show()
+
+
+def curve_statistics(scores, ci=95, n_boot=None, seed=0, max_bytes=256 * 1024 ** 2):
+    """
+    Compute the mean curve and its confidence interval for every (group, model) pair at once.
+
+    Parameters:
+    - scores: Array of shape (num_groups, num_models, num_train_sizes, num_seeds); NaN marks missing runs
+    - ci: Confidence level in percent
+    - n_boot: Number of bootstrap resamples of the seeds. If None, a normal-approximation
+      interval (mean +- z * standard error) is used, which needs no resampling.
+    - seed: Random seed of the bootstrap
+    - max_bytes: Memory budget of one bootstrap chunk; train sizes are processed in chunks
+
+    Returns mean, lower, upper arrays of shape (num_groups, num_models, num_train_sizes).
+    """
+    from statistics import NormalDist
+
+    scores = np.asarray(scores, dtype=float)
+    valid = ~np.isnan(scores)
+    counts = valid.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, scores, 0).sum(axis=-1) / counts
+
+    if n_boot is None:
+        z = NormalDist().inv_cdf(0.5 + ci / 200)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.where(valid, (scores - mean[..., None]) ** 2, 0).sum(axis=-1) / (counts - 1)
+            half_width = z * np.sqrt(var / counts)
+        half_width = np.where(counts > 1, half_width, 0)
+        return mean, mean - half_width, mean + half_width
+
+    num_seeds = scores.shape[-1]
+    resamples = np.random.default_rng(seed).integers(0, num_seeds, size=(n_boot, num_seeds))
+    # weights[k, b] counts how often seed k was drawn in resample b, so the sum over a resample's
+    # seeds is one matrix product and the (…, n_boot, num_seeds) block is never materialized
+    weights = np.zeros((num_seeds, n_boot))
+    np.add.at(weights, (resamples, np.arange(n_boot)[:, None]), 1)
+    filled = np.where(valid, scores, 0)
+    present = valid.astype(float)
+    lower, upper = np.empty_like(mean), np.empty_like(mean)
+    # Per train size: bootstrap sums, counts and the copy percentile sorts, all float64
+    bytes_per_size = 3 * scores[..., 0, 0].size * n_boot * 8
+    chunk = max(1, int(max_bytes // max(bytes_per_size, 1)))
+    for start in range(0, scores.shape[2], chunk):
+        # (groups, models, sizes, seeds) @ (seeds, n_boot) -> bootstrap means (groups, models, sizes, n_boot)
+        boot_means = filled[:, :, start:start + chunk] @ weights
+        boot_counts = present[:, :, start:start + chunk] @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            np.divide(boot_means, boot_counts, out=boot_means)
+        del boot_counts
+        # nanpercentile is much slower than percentile, so only use it when resamples hit missing runs
+        percentile = np.nanpercentile if np.isnan(boot_means).any() else np.percentile
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            lower[:, :, start:start + chunk], upper[:, :, start:start + chunk] = percentile(
+                boot_means, [50 - ci / 2, 50 + ci / 2], axis=-1)
+    return mean, lower, upper
+
+
+def plot_score_curves(
+    scores,
+    train_sizes,
+    groups,
+    models,
+    title="F1-Macro vs Train Size",
+    ylabel="Macro F1",
+    xlabel="Train Size",
+    ylim=(20, 90),
+    ci=95,
+    n_boot=None,
+    max_points=2000,
+    colors=None,
+    linestyles=None,
+    save_path=None
+):
+    """
+    Plots score vs training size for any number of test groups x models, with confidence bands.
+
+    Generalizes plot_f1_vs_train_size: colors distinguish groups and line styles distinguish
+    models. All means and intervals are computed in one batched pass (see curve_statistics),
+    curves longer than max_points are downsampled with LTTB, and all curves and bands are
+    drawn as one LineCollection and one PolyCollection.
+
+    Parameters:
+        scores (array): Shape (num_groups, num_models, num_train_sizes, num_seeds); NaN for missing runs.
+        train_sizes (list): X-axis values (training sizes).
+        groups, models (list): Names of the groups and models, used in the legend as "Group: Model".
+        title, xlabel, ylabel (str): Axis labels and plot title.
+        ylim (tuple): Y-axis limits.
+        ci (float): Confidence level of the bands in percent, or None for no bands.
+        n_boot (int): Bootstrap resamples for the bands; None uses a normal approximation.
+        max_points (int): Maximum number of points drawn per curve.
+        colors (list): One color per group (default: the tab10 colors).
+        linestyles (list): One line style per model (default: cycles '-', '--', '-.', ':').
+        save_path (str or list): Path(s) to save the plot image (e.g. "plot.png" or ["plot.png", "plot.pdf"]). If None, just displays.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.lines import Line2D
+
+    from .downsample import lttb_indices
+
+    with phase("prepare"):
+        scores = np.asarray(scores, dtype=float)
+        if scores.ndim == 3:
+            scores = scores[..., None]  # Single seed
+        train_sizes = np.asarray(train_sizes, dtype=float)
+        mean, lower, upper = curve_statistics(scores, ci=ci or 95, n_boot=n_boot)
+
+        colors = colors or [f"C{i % 10}" for i in range(len(groups))]
+        linestyles = linestyles or [["-", "--", "-.", ":"][i % 4] for i in range(len(models))]
+
+        segments, bands, line_colors, line_styles, handles = [], [], [], [], []
+        for g, group in enumerate(groups):
+            for m, model in enumerate(models):
+                finite = np.flatnonzero(np.isfinite(mean[g, m]))
+                keep = finite[lttb_indices(train_sizes[finite], mean[g, m, finite], max_points)]
+                x = train_sizes[keep]
+                segments.append(np.column_stack([x, mean[g, m, keep]]))
+                if ci:
+                    bands.append(np.concatenate([np.column_stack([x, lower[g, m, keep]]),
+                                                 np.column_stack([x[::-1], upper[g, m, keep][::-1]])]))
+                line_colors.append(colors[g])
+                line_styles.append(linestyles[m])
+                handles.append(Line2D([], [], color=colors[g], linestyle=linestyles[m], linewidth=2,
+                                      label=f"{group}: {model}"))
+
+    with phase("artists"):
+        sns.set(style="darkgrid", context="paper", palette="muted", font_scale=1.2)
+        plt.figure(figsize=(10, 6))
+        ax = plt.gca()
+        if bands:
+            ax.add_collection(PolyCollection(bands, facecolors=line_colors, edgecolors="none", alpha=0.2))
+        ax.add_collection(LineCollection(segments, colors=line_colors, linestyles=line_styles, linewidths=2))
+
+        plt.title(title, fontsize=14)
+        plt.xlabel(xlabel)
+        plt.ylabel(ylabel)
+        plt.xlim(0, train_sizes.max() + 100)
+        plt.ylim(*ylim)
+        plt.legend(handles=handles, title='Model', fontsize=10)
+
+    with phase("layout"):
+        tight_layout()
+
+    if save_path:
+        with phase("save"):
+            save_figure(save_path, dpi=300, bbox_inches=None)
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    plot_f1_vs_train_size(
+        train_sizes=[10, 20, 30, 40, 50, 100, 200, 300, 400, 500, 1000, 2000],
+        real_zero_shot=[64.79]*12,
+        real_few_shot=[68.9]*12,
+        real_xlmt=[36.51, 49.91, 54.38, 57.63, 61.85, 65.03, 72.36, 74.40, 76.58, 77.14, 79.35, 81.08],
+        func_zero_shot=[86.37]*12,
+        func_few_shot=[87.4]*12,
+        func_xlmt=[30.27, 36.68, 34.35, 26.70, 23.22, 30.50, 39.51, 50.89, 53.38, 55.28, 61.29, 63.92],
+        title="Macro-F1 vs Training Set Size (Real vs Functional)",
+        # save_path="f1_macro_clean_final.png"
+    )
@@ -0,0 +1,282 @@
+"""
+Render a batch of figures described by a manifest, headless and in parallel.
+
+A manifest is a JSON (or YAML, if PyYAML is installed) file holding a list of figure
+specs, either at the top level or under a "figures" key:
+
+    {
+      "figures": [
+        {
+          "name": "bar_chart_main",
+          "function": "generate_bar_chart",
+          "args": {
+            "data": {"$file": "results/scores.npy"},
+            "datasets": ["GermEval18", "SRW16"],
+            "methods": ["Task-Specific Source SFT", "Label-Specific Source SFT"]
+          },
+          "save_path": ["figures/bar_chart_main.png", "figures/bar_chart_main.pdf"],
+          "timeout": 60
+        }
+      ]
+    }
+
+Argument values of the form {"$file": path} are loaded from disk (.npy, .csv or .json);
+relative paths are resolved against the manifest directory. Arguments can also be read
+from a results store (see results_store.py), so a figure only loads the rows it plots:
+
+    "data": {"$results": "results_store", "dims": ["dataset", "method"], "value": "f1",
+             "agg": "mean", "where": {"prompt": "base", "method": ["Zero-Shot", "XLM-T"]}},
+    "datasets": {"$results": "results_store", "labels": "dataset", "where": {"prompt": "base"}}
+
+A "dims" reference becomes the aggregated array (ResultsStore.array) and a "labels"
+reference the matching axis labels (ResultsStore.labels). A "save_path" may also be a list
+of files, one per format, which are all written from a single draw (see export.py). Every figure is rendered in
+its own task on the Agg backend, so a failing or hanging figure does not affect the others.
+
+With --cache-dir, figures go through a RenderCache (see render_cache.py) and unchanged
+figures are copied from the cache instead of being re-rendered. With --profile, the time,
+peak memory and artist count of every phase of every figure are written to a JSON file.
+
+Usage:
+    python -m visualization_scripts.batch_render figures.json --jobs 4 --timeout 300 --cache-dir .figure_cache
+"""
+import argparse
+import importlib
+import json
+import os
+import signal
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .profiling import profile
+from .render_cache import RenderCache
+from .results_store import ResultsStore
+
+# Figure functions that can be named in a manifest, as (module, function) pairs
+FIGURE_FUNCTIONS = {
+    "generate_bar_chart": ("bar_chart", "generate_bar_chart"),
+    "generate_heatmap": ("heatmap", "generate_heatmap"),
+    "generate_radar_chart": ("radar_chart", "generate_radar_chart"),
+    "generate_radar_grid": ("radar_chart", "generate_radar_grid"),
+    "plot_f1_vs_train_size": ("bar_plot", "plot_f1_vs_train_size"),
+    "plot_score_curves": ("bar_plot", "plot_score_curves"),
+}
+
+# Arguments the figure functions index as NumPy arrays
+ARRAY_ARGUMENTS = {"data", "scores"}
+
+
+def read_manifest(path):
+    """Read the raw figure specs of a manifest, without resolving any references."""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+    return manifest["figures"] if isinstance(manifest, dict) else manifest
+
+
+def load_manifest(path):
+    """
+    Read a figure manifest and return its list of figure specs.
+
+    Each spec gets a "name" (defaulting to its position) and has its "$file" argument
+    references resolved relative to the manifest directory.
+    """
+    return resolve_specs(read_manifest(path), os.path.dirname(os.path.abspath(path)))
+
+
+def resolve_specs(specs, base_dir):
+    """
+    Validate raw figure specs, name them and resolve their references and paths against base_dir.
+
+    Figure names must be unique, since --only and the results refer to figures by name.
+    """
+    figures, names = [], set()
+    for i, spec in enumerate(specs):
+        if spec.get("function") not in FIGURE_FUNCTIONS:
+            raise ValueError(f"Figure {i}: unknown function {spec.get('function')!r}, "
+                             f"expected one of {sorted(FIGURE_FUNCTIONS)}")
+        spec = dict(spec, name=spec.get("name", f"figure_{i}"))
+        if spec["name"] in names:
+            raise ValueError(f"Figure {i}: duplicate name {spec['name']!r}")
+        names.add(spec["name"])
+        spec["args"] = {key: _resolve_value(value, base_dir) for key, value in spec.get("args", {}).items()}
+        if isinstance(spec.get("save_path"), list):
+            spec["save_path"] = [os.path.join(base_dir, path) for path in spec["save_path"]]
+        elif spec.get("save_path"):
+            spec["save_path"] = os.path.join(base_dir, spec["save_path"])
+        figures.append(spec)
+    return figures
+
+
+def _resolve_value(value, base_dir):
+    """Load {"$file": path} and {"$results": ...} argument references; leave every other value untouched."""
+    if isinstance(value, dict) and "$results" in value:
+        store = ResultsStore(os.path.join(base_dir, value["$results"]))
+        where = value.get("where", {})
+        if "labels" in value:
+            return store.labels(value["labels"], **where)
+        return store.array(value["dims"], value["value"], agg=value.get("agg", "mean"), **where)[0]
+    if not (isinstance(value, dict) and set(value) == {"$file"}):
+        return value
+    path = os.path.join(base_dir, value["$file"])
+    if path.endswith(".npy"):
+        return np.load(path)
+    if path.endswith(".csv"):
+        return np.loadtxt(path, delimiter=",")
+    with open(path) as f:
+        return json.load(f)
+
+
+def _init_worker():
+    """Force the non-interactive backend before any figure module imports pyplot."""
+    import matplotlib
+    matplotlib.use("Agg")
+    # The figure functions end in plt.show(), which only warns on Agg
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("figure rendering timed out")
+
+
+def render_figure(spec, timeout=None, cache_dir=None, cache_bytes=None, profile_phases=False):
+    """
+    Render a single figure spec and report how it went.
+
+    Returns a dict with the figure name, status ("ok", "failed" or "timeout"), wall time in
+    seconds, output path, whether it came from the render cache and error message (None on
+    success), plus the per-phase profile (see profiling.py) if profile_phases is set.
+    Exceptions never escape, so one broken figure cannot take down the batch.
+
+    The figure is rendered inside its own rc_context, so a style one figure sets globally
+    (sns.set, plt.style.use) does not leak into the next figure rendered by the same worker.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    timeout = spec.get("timeout", timeout)
+    start = time.perf_counter()
+    status, error, prof = "ok", None, None
+    cache = RenderCache(cache_dir, cache_bytes) if cache_dir else None
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        module_name, function_name = FIGURE_FUNCTIONS[spec["function"]]
+        func = getattr(importlib.import_module(f".{module_name}", __package__), function_name)
+        if cache:
+            func = cache.wrap(func)
+        kwargs = dict(spec.get("args", {}))
+        for key in ARRAY_ARGUMENTS & kwargs.keys():
+            kwargs[key] = np.asarray(kwargs[key])
+        if spec.get("save_path"):
+            save_paths = spec["save_path"] if isinstance(spec["save_path"], list) else [spec["save_path"]]
+            for path in save_paths:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            kwargs["save_path"] = spec["save_path"]
+        with matplotlib.rc_context():
+            if profile_phases:
+                with profile() as prof:
+                    func(**kwargs)
+            else:
+                func(**kwargs)
+    except TimeoutError as exc:
+        status, error = "timeout", str(exc)
+    except Exception as exc:
+        status, error = "failed", f"{type(exc).__name__}: {exc}"
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        plt.close("all")
+
+    return {
+        "name": spec["name"],
+        "status": status,
+        "seconds": time.perf_counter() - start,
+        "save_path": spec.get("save_path"),
+        "cached": bool(cache and cache.hits),
+        "error": error,
+        **({"profile": prof.to_dict() if prof else None} if profile_phases else {}),
+    }
+
+
+def render_manifest(figures, jobs=None, timeout=None, cache_dir=None, cache_bytes=1024 ** 3, profile_phases=False):
+    """
+    Render figure specs across a process pool and return their results in manifest order.
+
+    Parameters:
+    - figures: List of figure specs (see load_manifest)
+    - jobs: Number of worker processes (default: number of CPUs)
+    - timeout: Default per-figure timeout in seconds (a spec's own "timeout" wins)
+    - cache_dir: Directory of the render cache (optional, disables caching if None)
+    - cache_bytes: Size limit of the render cache
+    - profile_phases: Record the time, peak memory and artist count of each figure's phases
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = {pool.submit(render_figure, spec, timeout, cache_dir, cache_bytes, profile_phases): i
+                   for i, spec in enumerate(figures)}
+        for future in as_completed(futures):
+            i = futures[future]
+            spec = figures[i]
+            try:
+                results[i] = future.result()
+            except Exception as exc:
+                # The worker process itself died (e.g. killed or out of memory)
+                results[i] = {"name": spec["name"], "status": "failed", "seconds": float("nan"),
+                              "save_path": spec.get("save_path"), "cached": False,
+                              "error": f"{type(exc).__name__}: {exc}"}
+    return [results[i] for i in range(len(figures))]
+
+
+def print_summary(results, wall_time=None):
+    """Print a per-figure table of status and wall time."""
+    width = max([len(r["name"]) for r in results] + [6])
+    print(f"{'figure':<{width}}  {'status':<8}  {'seconds':>8}  cache")
+    for r in results:
+        print(f"{r['name']:<{width}}  {r['status']:<8}  {r['seconds']:>8.2f}  {'hit' if r['cached'] else ''}")
+        if r["error"]:
+            print(f"{'':<{width}}  {r['error']}")
+    ok = sum(r["status"] == "ok" for r in results)
+    hits = sum(r["cached"] for r in results)
+    summary = f"{ok}/{len(results)} figures rendered ({hits} from cache)"
+    if wall_time is not None:
+        summary += f" in {wall_time:.2f}s"
+    print(summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the figures listed in a manifest.")
+    parser.add_argument("manifest", help="JSON or YAML figure manifest")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-figure timeout in seconds")
+    parser.add_argument("--cache-dir", default=None, help="Directory of the render cache (disabled if omitted)")
+    parser.add_argument("--cache-size", type=float, default=1024, help="Render cache size limit in MB")
+    parser.add_argument("--profile", default=None, help="Write per-phase timings of every figure to this JSON file")
+    args = parser.parse_args(argv)
+
+    figures = load_manifest(args.manifest)
+    start = time.perf_counter()
+    results = render_manifest(figures, jobs=args.jobs, timeout=args.timeout, cache_dir=args.cache_dir,
+                              cache_bytes=int(args.cache_size * 1024 ** 2), profile_phases=bool(args.profile))
+    print_summary(results, wall_time=time.perf_counter() - start)
+    if args.profile:
+        with open(args.profile, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, int(args.cache_size * 1024 ** 2))
+        # Workers count hits and misses in their own processes, so rebuild the totals here
+        cache.hits = sum(r["cached"] for r in results)
+        cache.misses = sum(r["status"] == "ok" and not r["cached"] for r in results)
+        print(cache.report())
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""
+Shape-preserving downsampling of dense curves for plotting.
+"""
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Select `n_out` points of the curve (x, y) with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are split into
+    n_out - 2 buckets, and from each bucket LTTB keeps the point forming the largest
+    triangle with the previously kept point and the mean of the next bucket. Peaks and
+    dips survive, unlike with plain striding.
+
+    Parameters:
+    - x: 1D array of increasing x values
+    - y: 1D array of y values
+    - n_out: Number of points to keep
+
+    Returns the sorted indices of the kept points (all indices if n_out >= len(x)).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket i covers [edges[i], edges[i + 1]); the first and last points are their own buckets
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(int) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Twice the triangle area between the last kept point, each candidate and the next bucket mean
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
@@ -0,0 +1,262 @@
+"""
+Render-once export of a figure to PNG, SVG and PDF.
+
+savefig(..., bbox_inches='tight') draws a figure once to measure it and once more to write
+it, and every extra format repeats both passes. export_figure instead draws the figure a
+single time on an Agg canvas:
+
+- the tight bounding box is measured from that draw, widened to whole pixels of the canvas,
+  and handed to the vector formats as a fixed box, so they skip the measuring pass;
+- the PNG is cropped straight out of the Agg pixel buffer, without drawing again. It is
+  pixel-identical to savefig(..., bbox_inches=box) with that whole-pixel box; against
+  bbox_inches='tight' it may be up to two pixels wider and higher and its content sits up to
+  a pixel away, since savefig draws at the fractional offset of the unrounded box. Other
+  raster formats (JPEG, TIFF, ...) are written with savefig and the same box;
+- SVG and PDF are encoded in parallel worker processes from a pickled copy of the figure
+  (in-process, one after the other, if the figure cannot be pickled).
+
+Vector outputs stay small: artists made of more than `rasterize_above` primitives (bars,
+mesh cells, line vertices, annotation labels) are embedded as images in SVG and PDF files,
+at the export dpi, and so are axes holding more than that many separate patches (or, in
+SVG, text labels). The figure itself is left unchanged.
+
+Example:
+    report = export_figure(fig, ["figures/heatmap.png", "figures/heatmap.pdf"], dpi=300)
+    print(format_report(report))
+"""
+import logging
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .profiling import phase
+
+logger = logging.getLogger(__name__)
+
+# Artists with more primitives than this are rasterized in vector outputs
+RASTERIZE_ABOVE = 5000
+
+VECTOR_FORMATS = {"svg", "pdf", "eps", "ps"}
+
+
+def artist_complexity(artist):
+    """
+    Number of primitives an artist emits in a vector file.
+
+    Collections count their paths (or offsets), lines their vertices and artists that
+    define __len__ (such as the bar annotations of new_bar_plot) their length.
+    """
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+
+    if isinstance(artist, Collection):
+        return max(len(artist.get_paths()), len(artist.get_offsets()))
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata())
+    try:
+        return len(artist)
+    except TypeError:
+        return 1
+
+
+def _dense_artists(fig, rasterize_above, fmt):
+    """Artists of `fig` to rasterize when writing format `fmt`."""
+    from matplotlib.patches import Patch
+    from matplotlib.text import Text
+
+    if rasterize_above is None:
+        return []
+    # PDF and PS reference embedded fonts, so only SVG (glyphs as paths) gains from rasterizing text
+    kinds = (Text, Patch) if fmt == "svg" else (Patch,)
+    dense = []
+    for ax in fig.axes:
+        children = ax.get_children()
+        dense += [child for child in children if artist_complexity(child) > rasterize_above]
+        # Many small artists (one Text per heatmap cell, one Rectangle per bar) add up the same way
+        for kind in kinds:
+            many = [child for child in children if isinstance(child, kind) and child is not ax.patch]
+            if len(many) > rasterize_above:
+                dense += many
+    return [artist for artist in dense if not artist.get_rasterized()]
+
+
+def _format_of(path):
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _encode_vector(figure_bytes, path, dpi, bbox_inches):
+    """Worker task: write one vector file from a pickled figure. Returns (bytes, seconds)."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    fig = pickle.loads(figure_bytes)
+    try:
+        fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+    finally:
+        plt.close(fig)
+    return os.path.getsize(path), time.perf_counter() - start
+
+
+def _snap_to_pixels(bbox_inches, dpi, height):
+    """
+    Widen a box in inches to whole pixels of a canvas `height` pixels high at `dpi`.
+
+    Agg rows are counted from the top, so the box edges are snapped to the pixel grid of
+    the canvas top edge; savefig then draws the box at a whole-pixel offset.
+    """
+    from matplotlib.transforms import Bbox
+
+    x0, y0, x1, y1 = np.asarray(bbox_inches.extents) * dpi
+    left, right = np.floor(x0 + 1e-6), np.ceil(x1 - 1e-6)
+    top, bottom = np.floor(height - y1 + 1e-6), np.ceil(height - y0 - 1e-6)
+    return Bbox([[left / dpi, (height - bottom) / dpi], [right / dpi, (height - top) / dpi]])
+
+
+def _write_png(fig, canvas, path, dpi, bbox_inches):
+    """Write the already drawn Agg buffer as a PNG, cropped to bbox_inches (a whole-pixel Bbox in inches)."""
+    from matplotlib import image
+
+    pixels = np.asarray(canvas.buffer_rgba())
+    if bbox_inches is not None:
+        height = pixels.shape[0]
+        x0, y0, x1, y1 = np.round(np.array(bbox_inches.extents) * dpi).astype(int)
+        if x0 < 0 or y0 < 0 or x1 > pixels.shape[1] or y1 > height:
+            # Artists stick out of the canvas, so the buffer does not hold the whole picture
+            fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+            return
+        pixels = pixels[height - y1:height - y0, x0:x1]
+    image.imsave(path, pixels, dpi=dpi, format="png")
+
+
+def export_figure(fig, paths, dpi=300, bbox_inches="tight", rasterize_above=RASTERIZE_ABOVE, jobs=None):
+    """
+    Draw `fig` once and write it to one or more files, the format following each extension.
+
+    Parameters:
+    - fig: Matplotlib figure
+    - paths: Output path or list of paths, e.g. ["fig.png", "fig.svg", "fig.pdf"]
+    - dpi: Resolution of raster outputs and of rasterized artists in vector outputs
+    - bbox_inches: "tight" to crop to the drawn content (as in savefig), a Bbox in inches, or None for
+                   the full figure; boxes are widened to whole pixels at `dpi`
+    - rasterize_above: Rasterize artists with more primitives than this in vector outputs
+                       (None to keep everything as vectors)
+    - jobs: Number of processes encoding vector formats (default: one per vector file, up to the
+            number of CPUs; 1 to encode in-process)
+
+    Returns a report with one dict per file: format, path, bytes, seconds (time to encode and
+    write that file; vector files are drawn by their own backend within it), draw_seconds (the
+    shared Agg draw raster files are written from, 0 for vector files) and rasterized (number
+    of artists rasterized), and logs it at INFO level.
+    """
+    from matplotlib import rcParams
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+    paths = [os.fspath(path) for path in paths]
+    vector_paths = [path for path in paths if _format_of(path) in VECTOR_FORMATS]
+    raster_paths = [path for path in paths if path not in vector_paths]
+    report = []
+
+    # The one full draw: fixes the layout, measures the tight box and fills the pixel buffer
+    original_canvas, original_dpi = fig.canvas, fig.dpi
+    canvas = FigureCanvasAgg(fig)
+    try:
+        fig.dpi = dpi
+        start = time.perf_counter()
+        with phase("draw"):
+            canvas.draw()
+            if bbox_inches == "tight":
+                bbox_inches = fig.get_tightbbox(canvas.get_renderer()).padded(rcParams["savefig.pad_inches"])
+            if bbox_inches is not None:
+                bbox_inches = _snap_to_pixels(bbox_inches, dpi, canvas.get_width_height(physical=True)[1])
+        draw_seconds = time.perf_counter() - start
+        for path in raster_paths:
+            start = time.perf_counter()
+            with phase(f"encode {_format_of(path)}"):
+                if _format_of(path) == "png":
+                    _write_png(fig, canvas, path, dpi, bbox_inches)
+                else:
+                    # Other raster formats are drawn again by savefig, within their encode time
+                    fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+            report.append({"format": _format_of(path), "path": path, "bytes": os.path.getsize(path),
+                           "seconds": time.perf_counter() - start, "draw_seconds": draw_seconds, "rasterized": 0})
+    finally:
+        fig.dpi = original_dpi
+        fig.set_canvas(original_canvas)
+
+    for path, (size, seconds, rasterized) in zip(vector_paths, _encode_vectors(fig, vector_paths, dpi, bbox_inches,
+                                                                             rasterize_above, jobs)):
+        report.append({"format": _format_of(path), "path": path, "bytes": size, "seconds": seconds,
+                       "draw_seconds": 0.0, "rasterized": rasterized})
+
+    for entry in report:
+        logger.info("%s: %.1f KB in %.2fs (%d artists rasterized)", entry["path"], entry["bytes"] / 1024,
+                    entry["seconds"], entry["rasterized"])
+    return report
+
+
+def _encode_vectors(fig, paths, dpi, bbox_inches, rasterize_above, jobs):
+    """
+    Encode the vector files, in parallel processes when there is more than one and more than one CPU.
+
+    Returns (bytes, seconds, number of rasterized artists) per path.
+    """
+    jobs = min(len(paths), os.cpu_count() or 1) if jobs is None else jobs
+    parallel = jobs > 1 and len(paths) > 1
+    tasks, results = [], []
+    for path in paths:
+        dense = _dense_artists(fig, rasterize_above, _format_of(path))
+        for artist in dense:
+            artist.set_rasterized(True)
+        try:
+            if parallel:
+                try:
+                    tasks.append((path, pickle.dumps(fig), len(dense)))
+                    continue
+                except (pickle.PicklingError, AttributeError, TypeError):
+                    # e.g. an artist class defined inside a function; encode everything in-process
+                    parallel = False
+            start = time.perf_counter()
+            with phase(f"encode {_format_of(path)}"):
+                fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+            results.append((path, os.path.getsize(path), time.perf_counter() - start, len(dense)))
+        finally:
+            for artist in dense:
+                artist.set_rasterized(False)
+
+    if tasks:
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_worker)
+        with phase("encode parallel"), pool:
+            futures = [(path, pool.submit(_encode_vector, figure_bytes, path, dpi, bbox_inches), rasterized)
+                       for path, figure_bytes, rasterized in tasks]
+            results += [(path, *future.result(), rasterized) for path, future, rasterized in futures]
+    by_path = {path: result for path, *result in results}
+    return [by_path[path] for path in paths]
+
+
+def save_figure(save_path, dpi=300, bbox_inches="tight"):
+    """
+    Export the current pyplot figure to save_path (one path or a list of paths).
+
+    This is what the figure functions call in place of plt.savefig. Returns the export report.
+    """
+    import matplotlib.pyplot as plt
+
+    return export_figure(plt.gcf(), save_path, dpi=dpi, bbox_inches=bbox_inches)
+
+
+def format_report(report):
+    """Return an export report as a small table of format, size, shared draw time and encode time."""
+    lines = [f"{'format':<6}  {'size':>10}  {'draw':>6}  {'seconds':>8}  rasterized  path"]
+    for entry in report:
+        lines.append(f"{entry['format']:<6}  {entry['bytes'] / 1024:>8.1f}KB  {entry['draw_seconds']:>6.2f}  "
+                     f"{entry['seconds']:>8.2f}  {entry['rasterized']:>10}  {entry['path']}")
+    return "\n".join(lines)
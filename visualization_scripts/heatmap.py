@@ -0,0 +1,433 @@
+import numpy as np
+
+from .export import save_figure
+from .layout import tight_layout
+from .profiling import phase
+
+# Grid lines are dropped when a cell is narrower than this many pixels at save time
+MIN_GRID_CELL_PX = 4
+# Approximate vertical space (in font sizes) one tick label needs along its axis
+TICK_LABEL_SPACING = 1.4
+
+
+def _label_positions(labels, values, positional=False):
+    """
+    Resolve an array of labels (or integer positions) to positions in `labels`.
+
+    Labels are looked up through a hashed label->index map, so the cost is linear in
+    the number of values rather than in len(labels) per lookup. Unknown labels map to -1.
+    With positional=True, integer values are taken as positions, unless the labels are
+    integers themselves, in which case they are looked up as labels.
+    """
+    import pandas as pd
+
+    values = np.asarray(values)
+    if positional and values.dtype.kind in "iu" and np.asarray(labels).dtype.kind not in "iu":
+        return np.where((values >= 0) & (values < len(labels)), values, -1).astype(np.intp)
+    return pd.Index(labels).get_indexer(values)
+
+
+def build_relation_matrix(source_labels, target_labels, relations, source_col="source",
+                          target_col="target", score_col="score"):
+    """
+    Assemble the dense source x target score matrix from sparse relations.
+
+    Parameters:
+    - source_labels: List of source labels (rows)
+    - target_labels: List of target labels (columns)
+    - relations: One of
+        * a dict mapping source labels to {target label: score} dicts,
+        * a long-form DataFrame with source, target and score columns,
+        * a COO-style (rows, cols, values) tuple, where rows/cols are labels or integer positions
+          (integers are read as labels when the label lists themselves hold integers)
+    - source_col, target_col, score_col: Column names used when relations is a DataFrame
+
+    Returns:
+    - matrix: 2D float array of shape (len(source_labels), len(target_labels))
+    - mask: 2D bool array, True where a relation was given (the annotation layer)
+
+    Relations whose source or target is not in the label lists are ignored. The matrix is
+    filled with a single scatter, so the cost scales with the number of relations.
+    """
+    import pandas as pd
+
+    if isinstance(relations, pd.DataFrame):
+        rows = relations[source_col].to_numpy()
+        cols = relations[target_col].to_numpy()
+        values = relations[score_col].to_numpy(dtype=float)
+    elif isinstance(relations, dict):
+        rows = [source for source, targets in relations.items() for _ in targets]
+        cols = [target for targets in relations.values() for target in targets]
+        values = np.fromiter((score for targets in relations.values() for score in targets.values()),
+                             dtype=float, count=len(cols))
+    else:
+        rows, cols, values = relations
+        values = np.asarray(values, dtype=float)
+
+    # Only the COO form may give positions; dict keys and DataFrame cells are always labels
+    positional = not isinstance(relations, (pd.DataFrame, dict))
+    row_idx = _label_positions(source_labels, rows, positional)
+    col_idx = _label_positions(target_labels, cols, positional)
+    keep = (row_idx >= 0) & (col_idx >= 0)
+
+    matrix = np.zeros((len(source_labels), len(target_labels)))
+    mask = np.zeros(matrix.shape, dtype=bool)
+    matrix[row_idx[keep], col_idx[keep]] = values[keep]
+    mask[row_idx[keep], col_idx[keep]] = True
+    return matrix, mask
+
+
+def annotation_labels(matrix, mask, fmt="%.2f"):
+    """
+    Build the string annotation layer for a relation matrix.
+
+    Only cells set in `mask` are formatted; all other cells get an empty string.
+    """
+    annotations = np.full(matrix.shape, "", dtype=object)
+    annotations[mask] = np.char.mod(fmt, matrix[mask])
+    return annotations
+
+
+def select_annotations(matrix, mask, top_k=None, threshold=None):
+    """
+    Restrict the annotation mask to the cells worth labelling in a dense heatmap.
+
+    Parameters:
+    - matrix: 2D score matrix
+    - mask: 2D bool array of annotatable cells
+    - top_k: Keep only the k highest-scoring cells (optional)
+    - threshold: Keep only cells scoring at least this value (optional)
+    """
+    mask = mask.copy()
+    if threshold is not None:
+        mask &= matrix >= threshold
+    if top_k is not None:
+        flat = np.flatnonzero(mask)
+        if len(flat) > top_k:
+            keep = flat[np.argpartition(matrix.flat[flat], -top_k)[-top_k:]] if top_k > 0 else flat[:0]
+            mask[:] = False
+            mask.flat[keep] = True
+    return mask
+
+
+def tick_step(num_labels, axis_inches, fontsize):
+    """Return the stride that thins num_labels tick labels down to what fits along an axis."""
+    max_labels = max(1, int(axis_inches * 72 / (fontsize * TICK_LABEL_SPACING)))
+    return max(1, int(np.ceil(num_labels / max_labels)))
+
+
+def label_hierarchy(labels, sep=" - ", depth=None):
+    """
+    Split hierarchical labels such as "GermEval 18 - Fine-grained - Insult" into levels.
+
+    Parameters:
+    - labels: List of labels
+    - sep: Separator between the parts of a label
+    - depth: Number of levels (default: the largest number of parts of any label)
+
+    Returns a list of `depth` arrays; level k (1-based) holds the first k parts of every
+    label, e.g. "GermEval 18" at level 1 and "GermEval 18 - Fine-grained" at level 2. Labels
+    with fewer parts keep their full text at the deeper levels.
+    """
+    parts = [str(label).split(sep) for label in labels]
+    depth = depth or max((len(p) for p in parts), default=1)
+    return [np.array([sep.join(p[:k]) for p in parts], dtype=object) for k in range(1, depth + 1)]
+
+
+class HeatmapPyramid:
+    """
+    Multi-resolution pyramid of a label relation matrix.
+
+    Rows and columns are grouped by the levels of their hierarchical labels (see
+    label_hierarchy). Every level stores the sum, count and maximum of the relations in
+    each (row group, column group) block, and is reduced from the next finer level with
+    np.add.reduceat / np.maximum.reduceat, so the full matrix is only scanned once.
+    Means are derived from sum and count on selection.
+
+    Build one with build_heatmap_pyramid, pass it to generate_heatmap(pyramid=...) to draw
+    several overview and drill-down figures from it, and save()/load() it to reuse it
+    across runs.
+    """
+
+    AGGREGATIONS = ("mean", "sum", "max")
+
+    def __init__(self, levels, sep=" - "):
+        # level -> dict of row_labels, col_labels, sum, count, max; level len(levels) is the full matrix
+        self.levels = levels
+        self.sep = sep
+        self.depth = len(levels)
+
+    @classmethod
+    def from_matrix(cls, matrix, mask, source_labels, target_labels, sep=" - ", depth=None):
+        """Build the pyramid from a relation matrix and mask (see build_relation_matrix)."""
+        depth = depth or max(len(str(label).split(sep)) for label in [*source_labels, *target_labels])
+        row_levels = label_hierarchy(source_labels, sep, depth)
+        col_levels = label_hierarchy(target_labels, sep, depth)
+        # Sorting by every level keeps each group contiguous at every level
+        row_codes = [np.unique(level.astype(str), return_inverse=True)[1] for level in row_levels]
+        col_codes = [np.unique(level.astype(str), return_inverse=True)[1] for level in col_levels]
+        row_order = np.lexsort(row_codes[::-1])
+        col_order = np.lexsort(col_codes[::-1])
+
+        full = np.ix_(row_order, col_order)
+        levels = {depth: {
+            "row_labels": list(np.asarray(source_labels, dtype=object)[row_order]),
+            "col_labels": list(np.asarray(target_labels, dtype=object)[col_order]),
+            "sum": np.where(mask, matrix, 0.0)[full],
+            "count": mask[full].astype(np.int64),
+            "max": np.where(mask, matrix, -np.inf)[full],
+        }}
+        # Positions (in sorted order) of the first row / column of each group, per level
+        row_keys = [codes[row_order] for codes in row_codes]
+        col_keys = [codes[col_order] for codes in col_codes]
+        row_starts, col_starts = np.arange(len(row_order)), np.arange(len(col_order))
+        for level in range(depth - 1, 0, -1):
+            finer = levels[level + 1]
+            # Group boundaries of this level, expressed in groups of the finer level
+            row_group = row_keys[level - 1][row_starts]
+            col_group = col_keys[level - 1][col_starts]
+            rows = np.flatnonzero(np.r_[True, row_group[1:] != row_group[:-1]])
+            cols = np.flatnonzero(np.r_[True, col_group[1:] != col_group[:-1]])
+            levels[level] = {
+                "row_labels": list(row_levels[level - 1][row_order][row_starts[rows]]),
+                "col_labels": list(col_levels[level - 1][col_order][col_starts[cols]]),
+                "sum": np.add.reduceat(np.add.reduceat(finer["sum"], rows, axis=0), cols, axis=1),
+                "count": np.add.reduceat(np.add.reduceat(finer["count"], rows, axis=0), cols, axis=1),
+                "max": np.maximum.reduceat(np.maximum.reduceat(finer["max"], rows, axis=0), cols, axis=1),
+            }
+            row_starts, col_starts = row_starts[rows], col_starts[cols]
+        return cls(levels, sep)
+
+    def select(self, level=None, agg="mean", row_prefix=None, col_prefix=None):
+        """
+        Return (matrix, mask, row_labels, col_labels) at one level of the pyramid.
+
+        Parameters:
+        - level: 1 for datasets, 2 for dataset + granularity, ... (default: the full labels)
+        - agg: "mean", "sum" or "max" over the relations of each block
+        - row_prefix, col_prefix: Only keep the rows / columns under this label prefix, e.g.
+          "GermEval 18" to drill down into one dataset (optional)
+        """
+        if agg not in self.AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {agg!r}, expected one of {self.AGGREGATIONS}")
+        entry = self.levels[self.depth if level is None else level]
+        rows = self._under(entry["row_labels"], row_prefix)
+        cols = self._under(entry["col_labels"], col_prefix)
+        block = np.ix_(rows, cols)
+        count = entry["count"][block]
+        mask = count > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = entry["sum"][block] / count if agg == "mean" else entry[agg][block]
+        matrix = np.where(mask, matrix, 0.0)
+        return (matrix, mask, [entry["row_labels"][i] for i in rows], [entry["col_labels"][i] for i in cols])
+
+    def _under(self, labels, prefix):
+        if prefix is None:
+            return np.arange(len(labels))
+        return np.flatnonzero([label == prefix or label.startswith(prefix + self.sep) for label in labels])
+
+    def save(self, path):
+        """Write the pyramid to an .npz file."""
+        arrays = {}
+        for level, entry in self.levels.items():
+            for key in ("sum", "count", "max"):
+                arrays[f"{level}_{key}"] = entry[key]
+            arrays[f"{level}_row_labels"] = np.array(entry["row_labels"], dtype=str)
+            arrays[f"{level}_col_labels"] = np.array(entry["col_labels"], dtype=str)
+        np.savez_compressed(path, sep=np.array(self.sep), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read a pyramid written by save()."""
+        with np.load(path) as f:
+            depth = max(int(key.split("_")[0]) for key in f.files if key != "sep")
+            levels = {level: {
+                "row_labels": f[f"{level}_row_labels"].tolist(),
+                "col_labels": f[f"{level}_col_labels"].tolist(),
+                **{key: f[f"{level}_{key}"] for key in ("sum", "count", "max")},
+            } for level in range(1, depth + 1)}
+            return cls(levels, str(f["sep"]))
+
+
+def build_heatmap_pyramid(source_labels, target_labels, relations, sep=" - ", depth=None):
+    """
+    Parse the label hierarchy once and precompute every aggregation level of the relations.
+
+    Parameters:
+    - source_labels, target_labels, relations: As for generate_heatmap
+    - sep: Separator between the parts of the hierarchical labels
+    - depth: Number of label levels (default: the largest number of parts of any label)
+
+    Returns a HeatmapPyramid.
+    """
+    matrix, mask = build_relation_matrix(source_labels, target_labels, relations)
+    return HeatmapPyramid.from_matrix(matrix, mask, source_labels, target_labels, sep=sep, depth=depth)
+
+
+def _use_lod(matrix, mask, annot, lod_cells, annot_top_k, figsize, dpi):
+    """
+    Whether to draw in level-of-detail mode: when the matrix has more than lod_cells cells,
+    more cells to annotate than annot_top_k, or cells too small for grid lines at `dpi`.
+    """
+    if lod_cells is None or not matrix.size:
+        return False
+    num_rows, num_cols = matrix.shape
+    cell_px = min(figsize[0] / num_cols, figsize[1] / num_rows) * dpi
+    return (matrix.size > lod_cells or cell_px < MIN_GRID_CELL_PX
+            or (annot and annot_top_k is not None and mask.sum() > annot_top_k))
+
+
+def _draw_heatmap_lod(ax, matrix, mask, source_labels, target_labels, cmap, linewidths, cbar,
+                      figsize, dpi, fontsize):
+    """
+    Draw a dense heatmap as one rasterized image with a bounded number of artists.
+
+    Annotations are only drawn for cells set in `mask`, grid lines are only drawn when cells
+    are at least MIN_GRID_CELL_PX wide in the saved figure, and tick labels are thinned to
+    what fits along each axis.
+    """
+    import matplotlib.pyplot as plt
+    from seaborn.utils import relative_luminance
+
+    num_rows, num_cols = matrix.shape
+    image = ax.imshow(matrix, cmap=cmap, aspect="auto", interpolation="nearest",
+                      extent=(0, num_cols, num_rows, 0), rasterized=True)
+    if cbar:
+        plt.colorbar(image, ax=ax)
+
+    cell_px = min(figsize[0] / num_cols, figsize[1] / num_rows) * dpi
+    if linewidths and cell_px >= MIN_GRID_CELL_PX:
+        ax.vlines(np.arange(1, num_cols), 0, num_rows, colors="gray", linewidths=linewidths)
+        ax.hlines(np.arange(1, num_rows), 0, num_cols, colors="gray", linewidths=linewidths)
+
+    rows, cols = np.nonzero(mask)
+    if len(rows):
+        values = matrix[rows, cols]
+        luminance = np.atleast_1d(relative_luminance(image.cmap(image.norm(values))))
+        for row, col, value, lum in zip(rows, cols, values, luminance):
+            ax.text(col + 0.5, row + 0.5, f"{value:.2f}", ha="center", va="center",
+                    color=".15" if lum > .408 else "w")
+
+    x_step = tick_step(num_cols, figsize[0], fontsize)
+    y_step = tick_step(num_rows, figsize[1], fontsize)
+    ax.set_xticks(np.arange(0, num_cols, x_step) + 0.5, target_labels[::x_step])
+    ax.set_yticks(np.arange(0, num_rows, y_step) + 0.5, source_labels[::y_step])
+    return ax
+
+
+def generate_heatmap(source_labels, target_labels, relations, title="Heatmap of Label Relationships",
+                     figsize=(16, 10), cmap="Blues", annot=True, linewidths=0.5, cbar=True, save_path=None,
+                     lod_cells=2_500, annot_top_k=200, annot_threshold=None, dpi=300, level=None, agg="mean",
+                     pyramid=None, row_prefix=None, col_prefix=None):
+    """
+    Generate a professional heatmap for scientific papers with attention scores.
+
+    Parameters:
+    - source_labels: List of source labels (rows)
+    - target_labels: List of target labels (columns)
+    - relations: Dictionary mapping source labels to target labels with scores, a long-form
+      DataFrame or (rows, cols, values) arrays (see build_relation_matrix)
+    - title: Title of the heatmap (default: "Heatmap of Label Relationships")
+    - figsize: Tuple specifying figure size
+    - cmap: Color scheme
+    - annot: Whether to annotate cells with values
+    - linewidths: Line thickness between cells
+    - cbar: Whether to display the color bar
+    - save_path: Path to save the figure, or a list of paths to write several formats
+    - lod_cells: Cell count above which the level-of-detail mode is used (None disables it).
+      It draws the matrix as a single rasterized image, annotates only the cells picked by
+      annot_top_k / annot_threshold, drops sub-pixel grid lines and thins tick labels. It is
+      also used when more than annot_top_k cells would be annotated, or when cells are
+      narrower than MIN_GRID_CELL_PX pixels at `dpi`.
+    - annot_top_k: Number of highest-scoring cells annotated in level-of-detail mode
+    - annot_threshold: Minimum score of cells annotated in level-of-detail mode (optional)
+    - dpi: Resolution used when saving the figure
+    - level: Label hierarchy level to aggregate to, 1 for datasets and 2 for dataset + granularity
+      (default: the full labels)
+    - agg: How relations are aggregated within a block at coarser levels: "mean", "sum" or "max"
+    - pyramid: A HeatmapPyramid to draw from instead of source_labels / target_labels / relations
+      (which may then be None); build it once with build_heatmap_pyramid to draw several levels
+    - row_prefix, col_prefix: Only draw the rows / columns under this label prefix, e.g.
+      "GermEval 18" to drill down into one dataset (optional)
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
+    with phase("prepare"):
+        if pyramid is None and (level is not None or row_prefix is not None or col_prefix is not None):
+            pyramid = build_heatmap_pyramid(source_labels, target_labels, relations)
+        if pyramid is not None:
+            matrix, mask, source_labels, target_labels = pyramid.select(level, agg, row_prefix, col_prefix)
+        else:
+            matrix, mask = build_relation_matrix(source_labels, target_labels, relations)
+
+    with phase("artists"):
+        # Create figure
+        plt.figure(figsize=figsize)
+        if _use_lod(matrix, mask, annot, lod_cells, annot_top_k, figsize, dpi):
+            if annot:
+                mask = select_annotations(matrix, mask, top_k=annot_top_k, threshold=annot_threshold)
+            else:
+                mask = np.zeros_like(mask)
+            ax = _draw_heatmap_lod(plt.gca(), matrix, mask, list(source_labels), list(target_labels), cmap,
+                                   linewidths, cbar, figsize, dpi, fontsize=11)
+        else:
+            df_heatmap = pd.DataFrame(matrix, index=source_labels, columns=target_labels)
+            annotations = annotation_labels(matrix, mask) if annot else False
+            ax = sns.heatmap(df_heatmap, annot=annotations, fmt="", cmap=cmap, linewidths=linewidths,
+                             cbar=cbar, linecolor='gray', square=False)
+
+        # Add borders on all four sides
+        for _, spine in ax.spines.items():
+            spine.set_visible(True)
+            spine.set_linewidth(1)
+            spine.set_color('black')
+
+        # Format plot
+        # plt.title(title, fontsize=16, fontweight='bold')
+        plt.xlabel("Source Labels", fontsize=14)
+        plt.ylabel("Target Labels", fontsize=14)
+        plt.xticks(rotation=90, ha='center', fontsize=11)
+        plt.yticks(fontsize=11)
+
+    with phase("layout"):
+        tight_layout()
+
+    if save_path:
+        with phase("save"):
+            save_figure(save_path, dpi=dpi)
+
+    plt.show()
+
+if __name__ == "__main__":
+    source_target = {
+        "GermEval 18 - Binary - normal": {"Olid - Offensive": 81.06, "Xdomain - Politics - Offensive": 1.66, "Xdomain - Religion - Normal": 1.28},
+        "GermEval 18 - Binary - offensive": {"Hateval 19 - Aggressive - Normal": 11.5, "HASOC 19 - Fine-grained - Hate": 9.0, "HASOC 19 (de) - Binary - Normal": 6.04},
+        "GermEval 18 - Fine-grained - Normal": {"Xdomain - Politics - Normal": 78.34, "Xplain - Target - Racism": 1.78, "HASOC 19 (de) - Binary - Normal": 6.04},
+        "GermEval 18 - Fine-grained - Profanity": {"Xplain - Target - Religious": 98.81},
+        "GermEval 18 - Fine-grained - Insult": {"HASOC19 (en) - Targeted - Unintentional": 6.57, "Hateval 19 - Target - Generic": 5.95, "HASOC 19 (de) - Fine-grained - Offensive": 5.92},
+        "GermEval 18 - Fine-grained - Abuse": {"Xplain - Target - Racism": 61.57, "Olid - Offensive - Normal": 2.98, "Xdomain - Politics - Normal": 2.69},
+        "HateSpeech 18 - Binary - Normal": {"Hateval 19 - Target - Individial": 10.54, "SRW16 - Fine-grained - Racism": 7.8, "HASOC 19 - Fine-grained - Profanity": 5.33},
+        "HateSpeech 18 - Binary - Hate": {"Xdoamin - Politics - Hate": 91.02},
+        "SRW 16 - Binary - Offensive": {"HASOC19 (de) - Fine-grained - Hate": 17.75, "HASOC19 (de) - Fine-grained - Offensive": 17.21, "HASOC19 (de) - Fine-grained - Profanity": 17.17},
+        "SRW 16 - Binary - Normal": {"Olid - Offensive - Normal": 86.67},
+        # "SRW 16 - Fine-grained - sexism": {"HASOC19 (de) - Fine-grained - Profanity": 12.04, "HASOC19 (de) - Fine-grained - Hate": 11.96, "HASOC19 (de) - Fine-grained - Offensive": 11.76},
+        # "SRW 16 - Fine-grained - racism": {"HateSpeech18 - Binary - Hate": 15.1, "GermEval18 - Fine-grained - Profanity": 10.8, "Xdomain - Religion - Normal": 5.92},
+        # "SRW 16 - Fine-grained - normal": {"HASOC19 (en) - Targeted - Untentional": 17.7, "HASOC19 (de) - Fine-grained - Hate": 7.29, "HASOC19 (de)- Fine-grained - Profanity": 6.81},
+    }
+
+    source_labels = list(source_target.keys())
+    target_labels = sorted({label for targets in source_target.values() for label in targets.keys()})
+    relations = {
+        source: {
+            target: source_target[source].get(target, 0) for target in target_labels
+        } for source in source_labels
+    }
+
+    generate_heatmap(source_labels, target_labels, relations)
+
+    # Dataset-level overview and a drill-down into one dataset, both from the same pyramid
+    pyramid = build_heatmap_pyramid(source_labels, target_labels, relations)
+    generate_heatmap(None, None, None, pyramid=pyramid, level=1, agg="max", figsize=(8, 6))
+    generate_heatmap(None, None, None, pyramid=pyramid, level=2, row_prefix="GermEval 18")
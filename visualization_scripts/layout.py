@@ -0,0 +1,243 @@
+"""
+Cached text measurement and tight layout for figures that share their labels.
+
+tight_layout() and bbox_inches='tight' measure every tick label, axis label, title and
+legend entry of a figure. Matplotlib caches text metrics per renderer, but every figure
+gets a new renderer, so a batch of heatmaps over the same 500 labels measures the same
+strings again for each figure. This module adds two caches that live for the whole
+process:
+
+- TextExtentCache memoizes text metrics (width, height, descent) by string, the font file
+  the font properties resolve to (so a style change of font.sans-serif is a new entry),
+  size, weight, style, dpi and renderer type. Rotation is applied to the metrics afterwards, so
+  one entry serves a label at any angle.
+- LayoutEngine remembers the subplot margins tight_layout computed for a figure, keyed by
+  a signature of everything that determines them: figure size, axes positions, tick
+  locations, the text and font of every tick label, axis label, title and legend entry,
+  the text and position of every other text in the axes, the window extent of any other
+  artist drawn outside them (e.g. bar annotations), and the style rcParams. A figure with
+  a known signature gets those margins without being measured.
+
+The figure functions call tight_layout() from this module in place of plt.tight_layout().
+
+Example:
+    for relations in runs:
+        generate_heatmap(source_labels, target_labels, relations, save_path=...)
+    print(default_engine.report())
+"""
+import collections
+
+# rcParams groups that change text sizes, tick geometry or default spacing
+_STYLE_PREFIXES = ("font.", "text.", "mathtext.", "axes.", "xtick.", "ytick.", "legend.", "figure.subplot.")
+
+
+class TextExtentCache:
+    """
+    Bounded LRU cache of renderer text metrics, shared by all renderers of the same type.
+
+    Parameters:
+    - max_entries: Number of measured strings kept
+    """
+
+    def __init__(self, max_entries=100_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def metrics(self, renderer, text, fontprop, ismath, dpi):
+        """Return (width, height, descent) of `text` in pixels, as renderer.get_text_width_height_descent."""
+        from matplotlib import font_manager, rcParams
+
+        # hash(fontprop) only holds the family names ("sans-serif"), not the font they currently
+        # resolve to, so key on the font file findfont (itself cached per rcParams) picks
+        font = (font_manager.findfont(fontprop), fontprop.get_size_in_points(), fontprop.get_weight(),
+                fontprop.get_style(), fontprop.get_variant(), fontprop.get_stretch())
+        # Hinting changes Agg glyph sizes and mathtext sizes follow the math font set
+        key = (type(renderer), text, font, ismath, dpi, rcParams["text.hinting"],
+               rcParams["text.hinting_factor"], rcParams["mathtext.fontset"])
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = renderer.get_text_width_height_descent(text, fontprop, ismath=ismath)
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+text_extents = TextExtentCache()
+_original_metrics = None
+
+
+def enable_text_cache(cache=None):
+    """
+    Route matplotlib's text measurement through a TextExtentCache (text_extents by default).
+
+    Matplotlib looks text metrics up through matplotlib.text._get_text_metrics_with_cache,
+    the same hook its own test suite patches. Calling this again only swaps the cache.
+    """
+    global _original_metrics
+    import matplotlib.text
+
+    cache = cache or text_extents
+    if _original_metrics is None:
+        _original_metrics = matplotlib.text._get_text_metrics_with_cache
+
+    def _get_text_metrics_with_cache(renderer, text, fontprop, ismath, dpi):
+        return cache.metrics(renderer, text, fontprop, ismath, dpi)
+
+    matplotlib.text._get_text_metrics_with_cache = _get_text_metrics_with_cache
+
+
+def disable_text_cache():
+    """Restore matplotlib's own per-renderer text metrics cache."""
+    global _original_metrics
+    import matplotlib.text
+
+    if _original_metrics is not None:
+        matplotlib.text._get_text_metrics_with_cache = _original_metrics
+        _original_metrics = None
+
+
+def _text_key(text):
+    return (text.get_text(), hash(text.get_fontproperties()), text.get_rotation(), text.get_rotation_mode(),
+            text.get_horizontalalignment(), text.get_verticalalignment(), text.get_visible())
+
+
+def _legend_key(legend):
+    if legend is None:
+        return None
+    return (tuple(_text_key(text) for text in legend.get_texts()), _text_key(legend.get_title()), legend._loc,
+            legend.get_bbox_to_anchor().bounds, legend._ncols, legend.get_visible())
+
+
+def _axis_key(axis):
+    return (tuple(axis.get_majorticklocs()), tuple(_text_key(label) for label in axis.get_majorticklabels()),
+            _text_key(axis.label), axis.get_label_position(), axis.get_ticks_position())
+
+
+def _extra_keys(ax, renderer):
+    """
+    Keys of the children of `ax` that tight_layout measures besides its axes, titles and legend.
+
+    Plain texts (e.g. heatmap cell labels) are keyed by their text and display position. Other
+    artists that may extend past the axes, such as annotations or new_bar_plot's bar
+    annotations, are keyed by their measured extent.
+    """
+    from matplotlib.axes import Axes
+    from matplotlib.text import Annotation, Text
+
+    covered = {ax.xaxis, ax.yaxis, ax.title, ax._left_title, ax._right_title, ax.get_legend(), ax.patch,
+               *ax.spines.values()}
+    keys = []
+    for artist in ax.get_default_bbox_extra_artists():
+        if artist in covered or isinstance(artist, Axes):
+            continue
+        if isinstance(artist, Text) and not isinstance(artist, Annotation):
+            position = artist.get_transform().transform(artist.get_unitless_position())
+            keys.append((_text_key(artist), tuple(position)))
+            continue
+        if renderer is None:
+            renderer = artist.figure._get_renderer()
+        bbox = artist.get_tightbbox(renderer)
+        keys.append((type(artist).__name__, None if bbox is None else bbox.bounds))
+    return tuple(keys), renderer
+
+
+def layout_signature(fig):
+    """
+    Hashable description of everything tight_layout measures in `fig`.
+
+    Two figures with the same signature get the same margins from tight_layout. Taking
+    the signature formats the tick labels but measures no axis text; only artists other
+    than texts that may extend past their axes are measured.
+    """
+    from matplotlib import rcParams
+
+    axes = []
+    renderer = None
+    for ax in fig.axes:
+        extra, renderer = _extra_keys(ax, renderer)
+        axes.append((type(ax).__name__, ax.get_position(original=True).bounds, ax.get_visible(),
+                     ax.get_xlim(), ax.get_ylim(), _axis_key(ax.xaxis), _axis_key(ax.yaxis),
+                     tuple(_text_key(title) for title in (ax.title, ax._left_title, ax._right_title)),
+                     _legend_key(ax.get_legend()), extra))
+    style = tuple(sorted((key, repr(value)) for key, value in rcParams.items() if key.startswith(_STYLE_PREFIXES)))
+    return (tuple(fig.get_size_inches()), fig.dpi, tuple(axes), tuple(_text_key(text) for text in fig.texts),
+            tuple(_legend_key(legend) for legend in fig.legends), style)
+
+
+class LayoutEngine:
+    """
+    tight_layout with the resulting subplot margins cached by layout_signature.
+
+    Parameters:
+    - max_entries: Number of layouts kept
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._layouts = collections.OrderedDict()
+
+    def tight_layout(self, fig, **kwargs):
+        """
+        Apply tight_layout(**kwargs) to `fig`, reusing cached margins for a known signature.
+
+        Returns True if the margins came from the cache.
+        """
+        key = (layout_signature(fig), tuple(sorted(kwargs.items())))
+        params = self._layouts.get(key)
+        if params is not None:
+            self.hits += 1
+            self._layouts.move_to_end(key)
+            fig.subplots_adjust(**params)
+            return True
+        self.misses += 1
+        fig.tight_layout(**kwargs)
+        self._layouts[key] = {name: getattr(fig.subplotpars, name)
+                              for name in ("left", "right", "bottom", "top", "wspace", "hspace")}
+        if len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return False
+
+    def clear(self):
+        self._layouts.clear()
+        self.hits = self.misses = 0
+
+    def report(self):
+        """Return a one-line summary of layout and text measurement cache hits."""
+        return (f"layouts: {self.hits} reused, {self.misses} computed; text extents: {text_extents.hits} hits, "
+                f"{text_extents.misses} measured")
+
+
+default_engine = LayoutEngine()
+
+
+def tight_layout(fig=None, engine=None, **kwargs):
+    """
+    Drop-in replacement for plt.tight_layout() used by the figure functions.
+
+    Parameters:
+    - fig: Figure to lay out (default: the current pyplot figure)
+    - engine: LayoutEngine holding the cached margins (default: default_engine)
+    - kwargs: Passed on to Figure.tight_layout (pad, h_pad, w_pad, rect)
+
+    Also enables the shared text extent cache, so the tight bounding box measured when
+    saving reuses the same measurements.
+    """
+    import matplotlib.pyplot as plt
+
+    if _original_metrics is None:
+        enable_text_cache()
+    return (engine or default_engine).tight_layout(fig or plt.gcf(), **kwargs)
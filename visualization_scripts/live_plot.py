@@ -0,0 +1,303 @@
+"""
+Live-updating F1 vs train size plot fed by growing training result logs.
+
+LiveF1Plot tails one or more CSV or JSONL result logs, appends new points to the
+existing Line2D artists and periodically writes a refreshed PNG. Only the lines are
+redrawn between refreshes (blitting over a cached background); the full figure is
+re-rendered only when the axis limits or the legend change. Each series keeps a bounded
+buffer that halves its resolution when full, so memory stays constant however long the
+logs grow.
+
+Every log record needs a series name, a train size and a score, e.g. the JSONL line
+    {"series": "Real: XLM-T", "train_size": 200, "f1": 72.36}
+Series named in bar_plot.SERIES_STYLES are drawn in the same style as in
+plot_f1_vs_train_size.
+
+Usage:
+    python -m visualization_scripts.live_plot runs/*.jsonl --save-path live_f1.png --interval 10
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import time
+
+import numpy as np
+
+from .bar_plot import SERIES_STYLES
+
+
+class LogTail:
+    """
+    Incrementally read new records appended to a CSV (with header) or JSONL file.
+
+    Only complete lines are parsed; a trailing partial line is kept until it is finished.
+    If the file shrinks (truncated or rotated) it is read again from the start.
+    """
+
+    def __init__(self, path, chunk_bytes=1 << 20):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.offset = 0
+        self.header = None
+        self._partial = b""
+        self.is_csv = path.endswith(".csv")
+
+    def read_chunks(self):
+        """
+        Yield the records (lists of dicts) appended since the previous call, one list per
+        chunk of at most chunk_bytes, so a large backlog is never held in memory at once.
+
+        JSONL lines that are not valid JSON objects are skipped.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size < self.offset:
+            self.offset, self.header, self._partial = 0, None, b""
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            while self.offset < size:
+                chunk = f.read(min(self.chunk_bytes, size - self.offset))
+                if not chunk:
+                    break
+                self.offset += len(chunk)
+                *lines, self._partial = (self._partial + chunk).split(b"\n")
+                lines = [line.decode(errors="replace") for line in lines if line.strip()]
+                if lines:
+                    yield self._parse(lines)
+
+    def read_records(self):
+        """Return the list of records (dicts) appended since the previous call."""
+        return [record for records in self.read_chunks() for record in records]
+
+    def _parse(self, lines):
+        if not self.is_csv:
+            records = []
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Corrupt line, e.g. from a crashed writer
+                if isinstance(record, dict):
+                    records.append(record)
+            return records
+        rows = list(csv.reader(io.StringIO("\n".join(lines))))
+        if self.header is None and rows:
+            self.header, rows = rows[0], rows[1:]
+        return [dict(zip(self.header, row)) for row in rows]
+
+
+class BoundedSeries:
+    """
+    Append-only (x, y) buffer holding at most `capacity` points.
+
+    Points are kept at a stride of 1, 2, 4, ... of the incoming stream: whenever the buffer
+    fills up every other kept point is dropped and the stride doubles. The most recent point
+    is always reported, even when it falls between strides.
+    """
+
+    def __init__(self, capacity=10_000):
+        self.capacity = capacity - capacity % 2
+        self.x = np.empty(self.capacity)
+        self.y = np.empty(self.capacity)
+        self.size = 0
+        self.stride = 1
+        self.seen = 0
+        self.last = None
+
+    def extend(self, xs, ys):
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        if not len(xs):
+            return
+        self.last = (xs[-1], ys[-1])
+        start = 0
+        while start < len(xs):
+            index = self.seen + np.arange(start, len(xs))
+            keep = np.flatnonzero(index % self.stride == 0) + start
+            room = self.capacity - self.size
+            take = keep[:room]
+            self.x[self.size:self.size + len(take)] = xs[take]
+            self.y[self.size:self.size + len(take)] = ys[take]
+            self.size += len(take)
+            if len(keep) <= room:
+                break
+            # Buffer full: keep every other point and continue at twice the stride
+            half = self.size // 2
+            self.x[:half], self.y[:half] = self.x[:self.size:2].copy(), self.y[:self.size:2].copy()
+            self.size = half
+            self.stride *= 2
+            start = keep[room]
+        self.seen += len(xs)
+
+    def data(self):
+        """Return the kept points, followed by the latest point if it was not kept."""
+        x, y = self.x[:self.size], self.y[:self.size]
+        if self.last is not None and (self.seen - 1) % self.stride:
+            x, y = np.append(x, self.last[0]), np.append(y, self.last[1])
+        return x, y
+
+
+class LiveF1Plot:
+    """
+    Headless live F1 vs train size figure.
+
+    Parameters:
+    - paths: CSV or JSONL result logs to follow
+    - save_path: PNG path rewritten on every refresh
+    - series_col, x_col, y_col: Record fields holding the series name, train size and score
+    - min_interval: Minimum number of seconds between two PNG writes
+    - capacity: Maximum number of points kept per series
+    - title, xlabel, ylabel, ylim: As in plot_f1_vs_train_size
+    - dpi: Resolution of the written PNG
+    """
+
+    def __init__(self, paths, save_path, series_col="series", x_col="train_size", y_col="f1",
+                 min_interval=5.0, capacity=10_000, title="F1-Macro vs Train Size", ylabel="Macro F1",
+                 xlabel="Train Size", ylim=(20, 90), figsize=(10, 6), dpi=150):
+        import seaborn as sns
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.tails = [LogTail(path) for path in paths]
+        self.save_path = save_path
+        self.series_col, self.x_col, self.y_col = series_col, x_col, y_col
+        self.min_interval = min_interval
+        self.capacity = capacity
+        self.series = {}
+        self.lines = {}
+        self._background = None
+        self._last_write = float("-inf")
+        self.dirty = False  # New points not yet written to the PNG
+
+        sns.set(style="darkgrid", context="paper", palette="muted", font_scale=1.2)
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.ax.set_title(title, fontsize=14)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_xlim(0, 100)
+        self.ax.set_ylim(*ylim)
+
+    def poll(self):
+        """Read new records from all logs into the series buffers. Returns the number of records read."""
+        count = 0
+        updated = set()
+        for tail in self.tails:
+            for records in tail.read_chunks():
+                new_points = {}
+                for record in records:
+                    try:
+                        point = float(record[self.x_col]), float(record[self.y_col])
+                        name = str(record[self.series_col])
+                    except (KeyError, TypeError, ValueError):
+                        continue  # Malformed or unrelated record
+                    new_points.setdefault(name, []).append(point)
+                    count += 1
+                # Feed the buffers chunk by chunk, so memory stays bounded by the chunk size
+                for name, points in new_points.items():
+                    if name not in self.series:
+                        self._add_series(name)
+                    xs, ys = np.array(points).T
+                    self.series[name].extend(xs, ys)
+                updated.update(new_points)
+
+        for name in updated:
+            self.lines[name].set_data(*self.series[name].data())
+        self.dirty = self.dirty or bool(count)
+        return count
+
+    def _add_series(self, name):
+        self.series[name] = BoundedSeries(self.capacity)
+        style = SERIES_STYLES.get(name, dict(linewidth=2))
+        # Animated lines are skipped by full redraws and blitted on top of the cached background
+        # Markers are spaced along the curve so dense series do not turn into a solid band
+        self.lines[name], = self.ax.plot([], [], label=name, animated=True, markevery=0.05, **style)
+        self.ax.legend(title='Model', fontsize=10)
+        self._background = None
+
+    def _fit_limits(self):
+        """Grow the x-axis when data passes its end; returns True if the limits changed."""
+        x_max = max((series.data()[0].max() for series in self.series.values() if series.seen), default=0)
+        if x_max + 100 <= self.ax.get_xlim()[1]:
+            return False
+        # Grow geometrically so full redraws stay rare as train sizes increase
+        self.ax.set_xlim(0, max(x_max + 100, self.ax.get_xlim()[1] * 2))
+        return True
+
+    def render(self, force=False):
+        """
+        Redraw and write the PNG, at most once every min_interval seconds unless forced.
+
+        Returns True if a PNG was written.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_write < self.min_interval:
+            return False
+
+        if self._fit_limits() or self._background is None:
+            self.figure.tight_layout()
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        else:
+            self.canvas.restore_region(self._background)
+        renderer = self.canvas.get_renderer()
+        for line in self.lines.values():
+            line.draw(renderer)
+
+        # Write atomically so readers never see a half-written PNG
+        tmp_path = self.save_path + ".tmp.png"
+        self._write_buffer(tmp_path)
+        os.replace(tmp_path, self.save_path)
+        self._last_write = now
+        self.dirty = False
+        return True
+
+    def _write_buffer(self, path):
+        """Encode the current canvas pixels without triggering another draw."""
+        from matplotlib import image
+
+        image.imsave(path, np.asarray(self.canvas.buffer_rgba()), dpi=self.figure.dpi)
+
+    def follow(self, poll_interval=1.0, duration=None):
+        """
+        Poll the logs and refresh the PNG until interrupted (or for `duration` seconds).
+
+        Points that arrive within min_interval of the last write are written as soon as the
+        interval has passed, even if no further records arrive.
+        """
+        stop = None if duration is None else time.monotonic() + duration
+        try:
+            while stop is None or time.monotonic() < stop:
+                self.poll()
+                if self.dirty:
+                    self.render()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        self.poll()
+        self.render(force=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Follow training result logs and keep an F1 plot up to date.")
+    parser.add_argument("logs", nargs="+", help="CSV or JSONL result logs")
+    parser.add_argument("--save-path", required=True, help="PNG file to keep refreshed")
+    parser.add_argument("--interval", type=float, default=5.0, help="Minimum seconds between PNG writes")
+    parser.add_argument("--poll", type=float, default=1.0, help="Seconds between log polls")
+    parser.add_argument("--series-col", default="series")
+    parser.add_argument("--x-col", default="train_size")
+    parser.add_argument("--y-col", default="f1")
+    args = parser.parse_args(argv)
+
+    plot = LiveF1Plot(args.logs, args.save_path, series_col=args.series_col, x_col=args.x_col,
+                      y_col=args.y_col, min_interval=args.interval)
+    plot.follow(poll_interval=args.poll)
+
+
+if __name__ == "__main__":
+    main()
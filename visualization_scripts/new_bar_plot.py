@@ -0,0 +1,314 @@
+import numpy as np
+
+from .bar_chart import bar_collection
+from .export import save_figure
+from .layout import tight_layout
+from .profiling import phase
+
+# Sample data from your earlier message
+data = {
+    "Lang": ["es", "pt", "hi", "ar", "fr", "it", "de", "tr"],
+    "BloomZ Prompt": ["Classification", "Definition", "Cultural", "NLI", "NLI", "CoT", "CoT", "Role Play"],
+    "BloomZ F1": [54.50, 63.92, 51.33, 58.67, 55.63, 55.50, 38.36, 55.20],
+    "Aya101 Prompt": ["Definition", "Definition", "Classification", "Distinction", "Translation", "Vanilla", "Vanilla",
+                      "-"],
+    "Aya101 F1": [63.68, 71.51, 47.33, 64.67, 53.44, 74.82, 67.51, None],
+    "Llama3 Zero-shot Prompt": ["Classification", "Role Play", "CoT", "Classification", "CoT", "Distinction",
+                                "Role Play", "Classification"],
+    "Llama3 Zero-shot F1": [63.13, 70.79, 52.09, 62.66, 55.22, 75.86, 50.16, 76.16],
+    "Llama3 Few-shot Prompt": ["5 shot + CoT", "5 shot + Cultural", "5 shot + Role Play", "5 shot + Cultural",
+                               "5 shot + Definition", "5 shot + CoT", "5 shot + Cultural", "5 shot + CoT"],
+    "Llama3 Few-shot F1": [68.89, 73.70, 55.55, 66.93, 51.53, 76.18, 78.14, 81.76],
+    "Qwen Zero-shot Prompt": ["Translation", "Role Play + CoT", "Distinction", "NLI", "NLI", "Cultural", "Target",
+                              "Translation"],
+    "Qwen Zero-shot F1": [64.79, 73.44, 53.76, 70.61, 55.59, 73.34, 50.19, 75.89],
+    "Qwen Few-shot Prompt": ["5 shot + CoT", "5 shot + Role Play", "1 shot + CoT", "5 shot", "5 shot",
+                             "5 shot + Cultural", "5 shot + Definition", "5 shot + CoT"],
+    "Qwen Few-shot F1": [68.90, 72.56, 49.57, 65.88, 51.78, 79.00, 77.55, 77.03],
+"XLM-T (FT) F1":[82.78, 72.62, 59.18, 70.31, 51.42, 78.82, 79.18, 88.32],
+"XLM-T (FT) Prompt":[""]*8,
+"mDeBERTa (FT) F1":[81.45, 73.22, 51.34, 68.34, 51.56, 79.71, 80.39, 92.72],
+"mDeBERTa (FT) Prompt":[""]*8,
+}
+functional_data = { "Lang": ["es", "pt", "hi", "ar", "fr", "it", "de"],
+                    "BloomZ Prompt": ["Definition", "Definition", "Role Play", "Definition", "CoT", "Role Play", "Role Play"],
+                    "BloomZ F1": [64.88, 66.04, 51.99, 62.08, 63.34, 55.15, 51.75],
+                    "Aya101 Prompt": ["Distinction", "Distinction", "Distinction", "Vanilla", "Distinction", "Distinction", "Distinction"],
+                    "Aya101 F1": [73.19, 72.39, 65.95, 62.99, 71.94, 71.25, 72.64],
+                    "Llama3 Zero-shot Prompt": ["Vanilla", "Classification", "Classification", "Impact", "Vanilla", "Role Play", "Classification"],
+                    "Llama3 Zero-shot F1": [86.37, 83.37, 65.31, 64.00, 84.61, 79.72, 85.86],
+                    "Llama3 Few-shot Prompt": ["5 shot", "3 shot", "1 shot + Cultural", "1 shot", "5 shot + Role Play", "5 shot + COT", "5 shot + Cultural"],
+                    "Llama3 Few-shot F1": [86.45, 86.59, 65.36, 67.95, 84.37, 87.08, 89.65],
+                    "Qwen Zero-shot Prompt": ["Vanilla", "CoT", "Definition", "Vanilla", "Vanilla", "Target", "Impact"],
+                    "Qwen Zero-shot F1": [84.39, 82.15, 65.41, 70.42, 82.06, 78.35, 82.64],
+                    "Qwen Few-shot Prompt": ["5 shot + Definition", "5 shot + Definition", "1 shot + Definition", "3 shot + Definition", "5 shot + Definition", "5 shot + Definition", "5 shot + Definition"],
+                    "Qwen Few-shot F1": [86.43, 84.08, 66.61, 71.88, 86.08, 84.17, 86.62] ,
+
+                    "XLM-T (FT) F1": [67.93, 57.28, 23.26, 25.47, 26.61, 52.05, 70.60],
+                    "XLM-T (FT) Prompt": [""]*7,
+                    "mDeBERTa (FT) F1": [60.94, 58.94, 24.91, 23.93, 25.89, 54.07, 74.36],
+                    "mDeBERTa (FT) Prompt": [""]*7,
+                    }
+
+
+# Language code -> display name used for the x-axis
+LANGUAGE_NAMES = {
+    "es": "Spanish", "pt": "Portuguese", "hi": "Hindi", "ar": "Arabic",
+    "fr": "French", "it": "Italian", "de": "German", "tr": "Turkish"
+}
+
+# Model keys and colors
+MODELS = ["BloomZ", "Aya101", "Llama3 Zero-shot", "Llama3 Few-shot", "Qwen Zero-shot", "Qwen Few-shot", "XLM-T (FT)",
+          "mDeBERTa (FT)"]
+MODEL_COLORS = {
+    "BloomZ": "#005293",
+    "Aya101": "#87BFFF",
+    "Llama3 Zero-shot": "#6CA0DC",
+    "Llama3 Few-shot": "#FF8C42",
+    "Qwen Zero-shot": "#A2C4F2",
+    "Qwen Few-shot": "#FFBC7D",
+    "XLM-T (FT)": "#3CB371",
+    "mDeBERTa (FT)": "#77DD77"
+}
+
+
+def wide_to_long(data, models=MODELS):
+    """
+    Convert a wide results table ("Lang", "<model> F1", "<model> Prompt" columns, like `data`
+    and `functional_data` above) into the long form used by generate_grouped_prompt_bars.
+
+    Returns a DataFrame with lang, model, score and prompt columns.
+    """
+    import pandas as pd
+
+    wide = pd.DataFrame(data)
+    return pd.concat([
+        pd.DataFrame({"lang": wide["Lang"], "model": model, "score": wide[model + " F1"],
+                      "prompt": wide[model + " Prompt"]})
+        for model in models
+    ], ignore_index=True)
+
+
+def grouped_bar_arrays(df, lang_col="lang", model_col="model", score_col="score", prompt_col="prompt",
+                       languages=None, models=None):
+    """
+    Pivot a long-form results DataFrame into dense (language x model) arrays in one pass.
+
+    Parameters:
+    - df: DataFrame with one row per (language, model) bar
+    - lang_col, model_col, score_col, prompt_col: Column names
+    - languages, models: Order of the groups and of the bars within a group
+      (default: order of first appearance)
+
+    Returns:
+    - scores: 2D float array, 0 for missing scores
+    - prompts: 2D object array of annotations, "" where the score is missing
+    - languages, models: Labels of the rows and columns
+    """
+    import pandas as pd
+
+    lang_codes, languages = _factorize(df[lang_col], languages)
+    model_codes, models = _factorize(df[model_col], models)
+    keep = (lang_codes >= 0) & (model_codes >= 0)
+    lang_codes, model_codes = lang_codes[keep], model_codes[keep]
+
+    values = pd.to_numeric(df[score_col], errors="coerce").to_numpy(dtype=float)[keep]
+    present = ~np.isnan(values)
+    labels = df[prompt_col].fillna("").astype(str).to_numpy(dtype=object)[keep]
+
+    scores = np.zeros((len(languages), len(models)))
+    prompts = np.full(scores.shape, "", dtype=object)
+    scores[lang_codes[present], model_codes[present]] = values[present]
+    prompts[lang_codes[present], model_codes[present]] = labels[present]
+    return scores, prompts, languages, models
+
+
+def _factorize(column, order=None):
+    """Return integer codes for `column` and the list of labels they index (-1 if not in `order`)."""
+    import pandas as pd
+
+    if order is None:
+        codes, uniques = pd.factorize(column)
+        return codes, list(uniques)
+    return pd.Index(order).get_indexer(column), list(order)
+
+
+def _bar_annotations_class():
+    """
+    Define BarAnnotations on first use, so importing this module does not import matplotlib.
+
+    The class is stored as a module attribute (and served by the module __getattr__), so
+    figures holding it can be pickled, e.g. by export's parallel vector encoding.
+    """
+    if "BarAnnotations" in globals():
+        return globals()["BarAnnotations"]
+
+    import matplotlib.colors as mcolors
+    from matplotlib import artist, rcParams
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.transforms import Bbox
+
+    class BarAnnotations(artist.Artist):
+        """
+        A single artist that draws all vertical bar annotations in one pass.
+
+        Every label is written bottom-up, centred horizontally on its x (data coordinates) and
+        starting at its y, like plt.text(..., ha='center', va='bottom', rotation=90). The text
+        layout is measured once for the font rather than once per label.
+        """
+
+        zorder = 3  # Same as Text, above bars and grid lines
+
+        def __init__(self, x, y, labels, fontsize=11):
+            super().__init__()
+            self.x = np.asarray(x, dtype=float)
+            self.y = np.asarray(y, dtype=float)
+            self.labels = np.asarray(labels, dtype=object)
+            self.prop = FontProperties(size=fontsize)
+            self.set_clip_on(False)  # Like plt.text, annotations may extend above the axes
+
+        def __len__(self):
+            return len(self.labels)  # Lets export rasterize the labels in vector files when there are many
+
+        def _anchors(self, renderer):
+            """Return display-space baseline anchors and the glyph height and descent of the font."""
+            points = self.axes.transData.transform(np.column_stack([self.x, self.y]))
+            _, height, descent = renderer.get_text_width_height_descent("lp", self.prop, ismath=False)
+            # Rotated by 90 degrees the glyph box spans [x - (height - descent), x + descent]
+            points[:, 0] += (height - 2 * descent) / 2
+            return points, height, descent
+
+        def get_window_extent(self, renderer=None):
+            if not len(self.labels):
+                return Bbox.null()
+            renderer = renderer or self.figure._get_renderer()
+            points, height, descent = self._anchors(renderer)
+            # Measure each distinct label once; prompts repeat across bars
+            unique, inverse = np.unique(self.labels.astype(str), return_inverse=True)
+            widths = np.array([renderer.get_text_width_height_descent(label, self.prop, ismath=False)[0]
+                               for label in unique])[inverse]
+            return Bbox([[(points[:, 0] - height + descent).min(), points[:, 1].min()],
+                         [(points[:, 0] + descent).max(), (points[:, 1] + widths).max()]])
+
+        @artist.allow_rasterization
+        def draw(self, renderer):
+            if not self.get_visible() or not len(self.labels):
+                return
+            renderer.open_group("bar_annotations", self.get_gid())
+            points, _, _ = self._anchors(renderer)
+            if renderer.flipy():
+                points[:, 1] = renderer.get_canvas_width_height()[1] - points[:, 1]
+            gc = renderer.new_gc()
+            gc.set_foreground(mcolors.to_rgba(rcParams["text.color"]), isRGBA=True)
+            for (px, py), label in zip(points, self.labels):
+                renderer.draw_text(gc, px, py, label, self.prop, 90)
+            gc.restore()
+            renderer.close_group("bar_annotations")
+
+    BarAnnotations.__qualname__ = "BarAnnotations"  # Pickle looks the class up by this name
+    globals()["BarAnnotations"] = BarAnnotations
+    return BarAnnotations
+
+
+def __getattr__(name):
+    if name == "BarAnnotations":
+        return _bar_annotations_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _annotation_artist(x, y, labels, fontsize=11):
+    """Build a BarAnnotations artist writing labels[i] upwards from (x[i], y[i])."""
+    return _bar_annotations_class()(x, y, labels, fontsize)
+
+
+def generate_grouped_prompt_bars(df, lang_col="lang", model_col="model", score_col="score", prompt_col="prompt",
+                                 languages=None, models=None, colors=None, language_names=LANGUAGE_NAMES,
+                                 title=None, figsize=(20, 6), ylim=(20, 110), legend=False, annotate=True,
+                                 save_path=None):
+    """
+    Generate a grouped bar chart of scores per language and model, with each bar annotated
+    with the prompt that produced it.
+
+    Parameters:
+    - df: Long-form DataFrame with one row per (language, model) result
+    - lang_col, model_col, score_col, prompt_col: Column names
+    - languages, models: Order of the language groups and of the models within a group (optional)
+    - colors: Dict mapping model names to colors (default: MODEL_COLORS, then the tab20 colormap)
+    - language_names: Dict mapping language codes to tick labels
+    - title: Title drawn inside the top of the plot (optional)
+    - figsize: Tuple specifying figure size
+    - ylim: Y-axis limits
+    - legend: Whether to draw a legend of the models above the plot
+    - annotate: Whether to write the prompt above each bar
+    - save_path: Path to save the figure, or a list of paths to write several formats (optional)
+
+    The data is pivoted once into NumPy arrays, bar positions are computed for any number of
+    models, and all bars and all annotations are drawn as one artist each.
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as mcolors
+    import matplotlib.patches as mpatches
+
+    with phase("prepare"):
+        scores, prompts, languages, models = grouped_bar_arrays(df, lang_col, model_col, score_col, prompt_col,
+                                                                languages, models)
+        num_languages, num_models = scores.shape
+        x = np.arange(num_languages)
+
+        # Spacing setup: bars of a group fill 80% of the slot, centred on the tick
+        bar_width = 0.8 / num_models
+        offsets = (np.arange(num_models) - (num_models - 1) / 2) * bar_width
+
+        colors = {**MODEL_COLORS, **(colors or {})}
+        cmap = plt.get_cmap("tab20")
+        model_colors = mcolors.to_rgba_array([colors.get(model, cmap(i % cmap.N)) for i, model in enumerate(models)])
+
+    with phase("artists"):
+        plt.figure(figsize=figsize)
+        ax = plt.gca()
+        x_pos = (x[:, None] + offsets[None, :]).ravel()
+        heights = scores.ravel()
+        ax.add_collection(bar_collection(x_pos, heights, bar_width, np.tile(model_colors, (num_languages, 1))))
+        ax.autoscale_view()
+
+        # Annotate each bar with its prompt
+        if annotate:
+            labels = prompts.ravel()
+            annotated = np.flatnonzero(labels != "")
+            ax.add_artist(_annotation_artist(x_pos[annotated], heights[annotated] + 1.5, labels[annotated]))
+
+        # Final plot formatting
+        ax.set_xticks(x, [language_names.get(lang, lang) for lang in languages], fontsize=14)
+        ax.set_xlabel("Language", fontsize=14)
+        ax.set_ylabel("F1-Macro Score", fontsize=14)
+        ax.set_ylim(*ylim)
+        if legend:
+            handles = [mpatches.Patch(color=color, label=model) for model, color in zip(models, model_colors)]
+            ax.legend(handles=handles, title=None, fontsize=12, loc='lower left', bbox_to_anchor=(0, 1),
+                      ncol=min(num_models, 8))
+
+        # Title-like label inside the plot
+        if title:
+            ax.text(0.5, 0.95, title, ha='center', va='center', transform=ax.transAxes, fontsize=18,
+                    fontweight='bold')
+
+    with phase("layout"):
+        tight_layout()
+    if save_path:
+        with phase("save"):
+            save_figure(save_path, dpi=300)
+    plt.show()
+
+
+def main():
+    """Plot the functional test set figure and save it to figures/functional_test_set.svg."""
+    import matplotlib.pyplot as plt
+
+    # Set style to match example background
+    plt.style.use("seaborn-v0_8-darkgrid")
+    generate_grouped_prompt_bars(wide_to_long(functional_data), models=MODELS, title="Functional Test Set",
+                                 save_path='figures/functional_test_set.svg')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Opt-in per-phase profiling of the figure functions.
+
+The figure functions mark their phases (data preparation, artist creation, layout, saving)
+with `phase(name)`. Outside of a `profile()` block a phase costs nothing; inside one, every
+phase records its wall time, the peak memory allocated on top of what was in use when it
+started (via tracemalloc, which sees Python and NumPy allocations but not the pixel buffers
+matplotlib allocates in C++) and the number of artists in the open figures when it ended.
+Phases can nest, e.g. "save/draw" and "save/encode svg" inside "save".
+
+Example:
+    with profile() as prof:
+        generate_heatmap(source_labels, target_labels, relations, save_path="heatmap.png")
+    print(prof.summary())
+    prof.to_json("heatmap_profile.json")
+"""
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+# Profiles currently recording, innermost last
+_active = []
+
+
+def _artist_count():
+    """Number of artists in all open pyplot figures (0 if pyplot was never imported)."""
+    if "matplotlib.pyplot" not in sys.modules:
+        return 0
+    from matplotlib._pylab_helpers import Gcf
+
+    # Going through the figure managers, unlike plt.figure(num), leaves the current figure alone
+    return sum(len(manager.canvas.figure.findobj()) for manager in Gcf.get_all_fig_managers())
+
+
+class Profile:
+    """Phases recorded by one profile() block, in the order they started."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.phases = []
+        self._open = []
+
+    def _start(self, name):
+        path = "/".join([record["phase"] for record in self._open] + [name])
+        record = {"phase": path, "seconds": 0.0, "peak_mb": None, "artists": None}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing phase's peak before resetting the counter for this one
+            if self._open:
+                self._open[-1]["_peak"] = max(self._open[-1]["_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_base"], record["_peak"] = current, current
+        self.phases.append(record)
+        self._open.append(record)
+        record["_start"] = time.perf_counter()
+        return record
+
+    def _stop(self, record):
+        record["seconds"] = time.perf_counter() - record.pop("_start")
+        self._open.remove(record)
+        if self.trace_memory:
+            peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+            record["peak_mb"] = (peak - record.pop("_base")) / 1024 ** 2
+            if self._open:
+                self._open[-1]["_peak"] = max(self._open[-1]["_peak"], peak)
+        record["artists"] = _artist_count()
+
+    def total(self, phase=None):
+        """Total seconds of the top-level phases (or of every phase named `phase`)."""
+        if phase is None:
+            return sum(record["seconds"] for record in self.phases if "/" not in record["phase"])
+        return sum(record["seconds"] for record in self.phases if record["phase"] == phase)
+
+    def to_dict(self):
+        return {"total_seconds": self.total(), "phases": [dict(record) for record in self.phases]}
+
+    def to_json(self, path=None):
+        """Return the profile as a JSON string, also writing it to `path` if given."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def summary(self):
+        """Return a table of phases with their time, peak memory and artist count."""
+        width = max([len(record["phase"]) for record in self.phases] + [5])
+        lines = [f"{'phase':<{width}}  {'seconds':>8}  {'peak MB':>8}  {'artists':>8}"]
+        for record in self.phases:
+            peak = "" if record["peak_mb"] is None else f"{record['peak_mb']:.1f}"
+            lines.append(f"{record['phase']:<{width}}  {record['seconds']:>8.3f}  {peak:>8}  {record['artists']:>8}")
+        lines.append(f"{'total':<{width}}  {self.total():>8.3f}")
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile(trace_memory=True):
+    """
+    Record the phases of everything run inside the block.
+
+    Parameters:
+    - trace_memory: Measure peak memory per phase with tracemalloc (slows Python allocations down)
+
+    Yields the Profile being filled.
+    """
+    prof = Profile(trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _active.append(prof)
+    try:
+        yield prof
+    finally:
+        _active.remove(prof)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Mark a phase of a figure function; only recorded inside a profile() block."""
+    if not _active:
+        yield
+        return
+    prof = _active[-1]
+    record = prof._start(name)
+    try:
+        yield
+    finally:
+        prof._stop(record)
@@ -0,0 +1,208 @@
+import numpy as np
+
+from .export import save_figure
+from .layout import tight_layout
+from .profiling import phase
+
+
+def _method_marker(method):
+    """Source-side methods are drawn with stars, all others (target-side) with circles."""
+    return "*" if 'Source' in method else "o"
+
+
+def radar_polygons(data):
+    """
+    Compute the angles and closed polygons of radar charts in one vectorized step.
+
+    Parameters:
+    - data: Array of shape (..., num_datasets, num_methods)
+
+    Returns:
+    - angles: 1D array of num_datasets + 1 angles, the first repeated at the end
+    - values: Array of shape (..., num_datasets + 1, num_methods), the first dataset repeated at the end
+    """
+    data = np.asarray(data, dtype=float)
+    num_vars = data.shape[-2]
+    angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False)
+    return np.append(angles, angles[0]), np.concatenate([data, data[..., :1, :]], axis=-2)
+
+
+def generate_radar_chart(data, datasets, methods, title="Performance Across Datasets (Radar Chart)",
+                         save_path=None, max_methods=None, errors=None, significance=None):
+    """
+    Generate a radar chart for comparing multiple settings across datasets.
+
+    Parameters:
+    - data: 2D numpy array of shape (num_datasets, num_methods)
+    - datasets: List of dataset names
+    - methods: List of method names (settings)
+    - title: Chart title
+    - save_path: Path to save the figure, or a list of paths to write several formats (optional)
+    - max_methods: Only draw the first max_methods methods, for readability (optional, default: all)
+    - errors: Uncertainty drawn as a band around each method, shaped like data, or
+      (2, num_datasets, num_methods) for asymmetric lower/upper errors (optional, see
+      significance.interval_errors)
+    - significance: Markers such as "*" drawn next to each point, shaped like data, with "" for
+      no marker (optional, see significance.significance_markers)
+    """
+    import matplotlib.pyplot as plt
+
+    with phase("prepare"):
+        angles, values = radar_polygons(data)
+        if errors is not None:
+            errors = np.broadcast_to(np.asarray(errors, dtype=float), (2,) + np.shape(data))
+            _, lower = radar_polygons(data - errors[0])
+            _, upper = radar_polygons(data + errors[1])
+        if significance is not None:
+            significance = np.asarray(significance, dtype=object)
+
+    with phase("artists"):
+        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
+
+        for i, method in enumerate(methods[:max_methods]):
+            line, = ax.plot(angles, values[:, i], marker=_method_marker(method), label=method, linewidth=2)
+            if errors is not None:
+                ax.fill_between(angles, lower[:, i], upper[:, i], color=line.get_color(), alpha=0.15, linewidth=0)
+            if significance is not None:
+                for d in np.flatnonzero(significance[:, i] != ""):
+                    ax.annotate(significance[d, i], (angles[d], values[d, i]), xytext=(0, 4),
+                                textcoords="offset points", ha="center", va="bottom", fontsize=10,
+                                color=line.get_color())
+
+        ax.set_xticks(angles[:-1])
+        ax.set_xticklabels(datasets, fontsize=12)
+
+        # Modify y-axis to start from 0.2
+        ylim_max = (data.max() if errors is None else np.nanmax(upper)) + 0.1  # Ensure full range is visible
+        ax.set_ylim(40, ylim_max)
+        # ax.set_yticks(np.linspace(30, ylim_max, 5))
+        # ax.set_yticklabels([f'{x:.1f}' for x in np.linspace(0.2, ylim_max, 5)], fontsize=10)
+
+        # ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+
+        # Place legend inside the plot, lower right quadrant
+        ax.legend(loc='lower right', bbox_to_anchor=(0.1, -0.1), fontsize=10,
+                  frameon=True, title="Methods")
+
+    with phase("layout"):
+        tight_layout()
+    if save_path:
+        with phase("save"):
+            save_figure(save_path, dpi=300)
+    plt.show()
+
+def generate_radar_grid(data, datasets, methods, experiments=None, ncols=4, panel_size=3.5, ylim=None,
+                        save_path=None, dpi=300):
+    """
+    Generate small-multiple radar charts, one panel per experiment, with a single shared legend.
+
+    Parameters:
+    - data: 3D numpy array of shape (num_experiments, num_datasets, num_methods)
+    - datasets: List of dataset names
+    - methods: List of method names (settings); any number is supported
+    - experiments: List of panel titles (optional)
+    - ncols: Number of panels per row
+    - panel_size: Width and height of one panel in inches
+    - ylim: Radial limits shared by all panels (default: 40, or lower if needed, to the maximum score)
+    - save_path: Path to save the figure, or a list of paths to write several formats (optional)
+    - dpi: Resolution of the saved figure
+
+    Angles, closed polygons, ticks and limits are computed once and applied to every panel, and
+    each panel draws its methods with at most two plot() calls. The panels deliberately do not
+    use sharex/sharey: matplotlib measures the ticks of every sibling of a shared axis, which
+    makes drawing quadratic in the number of panels.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.lines import Line2D
+
+    with phase("prepare"):
+        data = np.asarray(data, dtype=float)
+        num_experiments = data.shape[0]
+        angles, values = radar_polygons(data)
+        nrows = -(-num_experiments // ncols)
+        ncols = min(ncols, num_experiments)
+
+        cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        colors = [cycle[i % len(cycle)] for i in range(len(methods))]
+        markers = np.array([_method_marker(method) for method in methods])
+        marker_groups = [(marker, np.flatnonzero(markers == marker)) for marker in np.unique(markers)]
+        if ylim is None:
+            ylim = (min(40, np.floor(np.nanmin(data))), np.nanmax(data) + 0.1)
+
+    with phase("artists"):
+        fig, axes = plt.subplots(nrows, ncols, figsize=(ncols * panel_size, nrows * panel_size),
+                                 subplot_kw=dict(polar=True), squeeze=False)
+        axes = axes.ravel()
+        for e, ax in enumerate(axes[:num_experiments]):
+            for marker, idx in marker_groups:
+                ax.set_prop_cycle(color=[colors[i] for i in idx])
+                ax.plot(angles, values[e][:, idx], marker=marker, linewidth=1.5, markersize=4)
+            ax.set_xticks(angles[:-1], datasets, fontsize=8)
+            ax.set_ylim(*ylim)
+            ax.tick_params(axis="y", labelsize=7)
+            if experiments is not None:
+                # A plain text artist: set_title re-measures every tick label to place the title
+                ax.text(0.5, 1.2, experiments[e], transform=ax.transAxes, ha="center", va="bottom", fontsize=11)
+        for ax in axes[num_experiments:]:
+            ax.set_visible(False)
+
+        handles = [Line2D([], [], color=colors[i], marker=_method_marker(method), linewidth=1.5, label=method)
+                   for i, method in enumerate(methods)]
+        fig.legend(handles=handles, loc="lower center", ncol=min(len(methods), 4), fontsize=10, frameon=True,
+                   title="Methods")
+
+    with phase("layout"):
+        # Fixed spacing instead of tight_layout, whose cost grows with the number of panels
+        fig.subplots_adjust(left=0.05, right=0.95, top=1 - 0.8 / (nrows * panel_size),
+                            bottom=(0.4 + 0.25 * -(-len(methods) // 4)) / (nrows * panel_size) + 0.02,
+                            wspace=0.5, hspace=0.7)
+
+    if save_path:
+        # The margins are already fixed above, so skip the extra draw passes of bbox_inches='tight'
+        with phase("save"):
+            save_figure(save_path, dpi=dpi, bbox_inches=None)
+    plt.show()
+
+
+# Example Usage
+if __name__ == "__main__":
+    datasets_0 = {
+        "GermEval18":[69.98, 70.46, 69.23, 70.37],
+                "SRW16":[83.29, 85.94, 85.82, 85.77],
+                "HateSpeech18":[72.57, 74.42, 74.94, 74.94],
+                # "OLID":[76.01, 76.36, 76.20, 76.86],
+                "OLID (target)":[49.31, 52.31, 48.62, 50.38],
+                "OLID (targeted)":[54.28, 60.28, 50.96, 63.69],
+                "HASOC19(de)":[55.23, 55.00, 55.22, 56.09],
+                "average":[58.51, 60.01, 58.14, 60.89]}
+    datasets_1 = {
+                  # "GermEval18 (fine-grained)": [32.14, 40.23, 37.57, 42.33],
+                "GermEval18":[62.67, 70.98, 70.58, 70.75],
+                "SRW16":[83.11, 85.27, 85.69, 87.78],
+                "HateSpeech18":[73.58, 76.43, 76.62, 77.03],
+                # "SRW16 (fine-grained)":[57.55, 58.26, 58.60, 59.39],
+                # "OLID":[77.48, 78.4, 78.65, 79.04],
+                "OLID (target)":[52.02, 61.47, 55.75, 67.71],
+                "OLID (targeted)":[54.68, 57.51, 48.96, 56.73],
+                "HASOC19(de)":[52.95, 51.92, 53.23, 53.57],
+                "average":[57.11, 61.32, 60.51, 62.51],
+    }
+    datasets_2 = {
+        "GermEval18":[73.47, 72.12, 73.47, 73.93],
+        "SRW16":[85.18, 85.92, 86.71, 87.22 ],
+        "HateSpeech18":[76.02, 76.65, 78.66, 76.83],
+        # "OLID":[78.38, 79.78, 78.74, 80.30],
+        "OLID (targeted)":[57.57, 62.16, 58.67, 64.43],
+        "OLID (target)":[46.31, 51.37, 49.77, 52.37],
+        "HASOC19(de)":[55.10, 59.59, 52.90, 54.38],
+        "average":[60.83, 61.06, 62.03, 62.39],
+    }
+    methods = ["Task-Specific Source SFT", "Label-Specific Source SFT", "Task-Specific Target SFT", "Label-Specific Target SFT"]
+    np.random.seed(42)
+    scores = np.array([np.array(values) for key,values in datasets_2.items()])
+    generate_radar_chart(scores, datasets_2, methods)
+
+    # Small multiples of the three result sets (they list the OLID datasets in different orders)
+    names = list(datasets_0)
+    grid = np.array([[results[name] for name in names] for results in (datasets_0, datasets_1, datasets_2)])
+    generate_radar_grid(grid, names, methods, experiments=["datasets_0", "datasets_1", "datasets_2"], ncols=3)
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""
+Content-addressed disk cache for rendered figures.
+
+A figure is identified by a hash of everything that determines its pixels: the call
+arguments (NumPy arrays, DataFrames, heatmap pyramids and colormaps are hashed by content;
+calls with any other kind of object are rendered uncached), the matplotlib rcParams
+in effect, the matplotlib version and the source of every module of this package (a
+figure function also depends on export, layout and the shared drawing helpers). When the
+same figure is requested again, the cached file is copied to save_path instead of
+re-rendering. The cache is bounded in size and evicts the least recently used entries.
+
+Figures are rendered inside an rc_context, so a function that sets a global style
+(sns.set) does not change the rcParams, and so the keys, of the figures after it.
+
+Example:
+    cache = RenderCache("~/.cache/figures", max_bytes=2 * 1024 ** 3)
+    cached_heatmap = cache.wrap(generate_heatmap)
+    cached_heatmap(source_labels, target_labels, relations, save_path="figures/heatmap.png")
+    print(cache.report())
+"""
+import functools
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+# Values hashed by their repr, which holds their whole content
+_SCALARS = (type(None), bool, int, float, complex, str, bytes, np.generic)
+
+
+def _update_hash(h, value):
+    """
+    Feed a (possibly nested) argument value into hash object `h`, by content.
+
+    Raises TypeError for values it cannot hash by content; their repr may only hold a
+    memory address.
+    """
+    from .heatmap import HeatmapPyramid
+
+    if isinstance(value, _SCALARS):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, os.PathLike):
+        h.update(f"path:{os.fspath(value)!r};".encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray:{value.dtype.str}:{value.shape}:".encode())
+        if value.dtype.hasobject:
+            _update_hash(h, value.tolist())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif type(value).__module__.startswith("pandas"):
+        import pandas as pd
+        h.update(f"{type(value).__name__}:{list(getattr(value, 'columns', []))}:".encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        h.update(b"dict:")
+        for key in sorted(value, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _update_hash(h, item)
+    elif isinstance(value, (set, frozenset)):
+        _update_hash(h, sorted(value, key=repr))
+    elif isinstance(value, HeatmapPyramid):
+        h.update(b"HeatmapPyramid:")
+        _update_hash(h, [value.sep, value.levels])
+    elif type(value).__module__.startswith("matplotlib") and _is_colormap(value):
+        h.update(f"Colormap:{value.name}:{value.N}:".encode())
+        _update_hash(h, [value(np.arange(value.N)), value.get_under(), value.get_over(), value.get_bad()])
+    else:
+        raise TypeError(f"Cannot hash a {type(value).__name__} argument by content")
+
+
+def _is_colormap(value):
+    from matplotlib.colors import Colormap
+
+    return isinstance(value, Colormap)
+
+
+def _code_files(func):
+    """Source files `func` may depend on: every module of this package, plus func's own file."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    files = sorted(os.path.join(package_dir, name) for name in os.listdir(package_dir) if name.endswith(".py"))
+    source = os.path.abspath(inspect.getsourcefile(func))
+    return files if source in files else files + [source]
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version(func):
+    """Hash of the plotting code behind `func`, so edits to any of it invalidate entries."""
+    import matplotlib
+
+    h = hashlib.sha256(f"matplotlib:{matplotlib.__version__}".encode())
+    for path in _code_files(func):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _style_version():
+    """Hash of the current matplotlib rcParams (covers sns.set / plt.style.use)."""
+    import matplotlib
+
+    h = hashlib.sha256()
+    for key, value in sorted(matplotlib.rcParams.items()):
+        h.update(f"{key}={value!r};".encode())
+    return h.hexdigest()
+
+
+class RenderCache:
+    """
+    Disk cache of rendered figure files, keyed by content hash with size-based LRU eviction.
+
+    Parameters:
+    - directory: Directory holding the cached files (created if missing)
+    - max_bytes: Total size above which the least recently used entries are evicted
+    """
+
+    def __init__(self, directory, max_bytes=1024 ** 3):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0  # Calls with an argument that cannot be hashed by content
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, func, arguments):
+        """Return the cache key for calling `func` with the bound `arguments` dict."""
+        h = hashlib.sha256(f"{func.__module__}.{func.__qualname__}".encode())
+        h.update(_code_version(func).encode())
+        h.update(_style_version().encode())
+        _update_hash(h, {name: value for name, value in arguments.items() if name != "save_path"})
+        return h.hexdigest()
+
+    def _entry_paths(self, key, save_paths):
+        return [os.path.join(self.directory, key + os.path.splitext(path)[1]) for path in save_paths]
+
+    def render(self, func, *args, **kwargs):
+        """
+        Call figure function `func`, or reuse its cached output.
+
+        `func` must accept a save_path argument, either one path or a list of paths (one per
+        format). Calls without a save_path are passed through uncached, since there is no
+        output file to reuse.
+        Returns the save_path the figure was written to (or None).
+        """
+        import matplotlib
+
+        arguments = inspect.signature(func).bind(*args, **kwargs)
+        arguments.apply_defaults()
+        save_path = arguments.arguments.get("save_path")
+        if not save_path:
+            func(*args, **kwargs)
+            return None
+
+        save_paths = [save_path] if isinstance(save_path, (str, os.PathLike)) else list(save_path)
+        try:
+            key = self.key(func, arguments.arguments)
+        except TypeError:
+            # An argument that cannot be hashed by content; render it uncached
+            self.uncached += 1
+            func(*args, **kwargs)
+            return save_path
+        entries = self._entry_paths(key, save_paths)
+        if all(os.path.exists(entry) for entry in entries):
+            self.hits += 1
+            for entry, path in zip(entries, save_paths):
+                os.utime(entry)  # Mark as recently used
+                if os.path.abspath(entry) != os.path.abspath(path):
+                    shutil.copyfile(entry, path)
+            return save_path
+
+        self.misses += 1
+        # Keep any global style the function sets out of the rcParams later keys are taken from
+        with matplotlib.rc_context():
+            func(*args, **kwargs)
+        for entry, path in zip(entries, save_paths):
+            # Write to a temporary file first so concurrent workers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, entry)
+        self.evict()
+        return save_path
+
+    def wrap(self, func):
+        """Return `func` with this cache in front of it."""
+        @functools.wraps(func)
+        def cached_func(*args, **kwargs):
+            return self.render(func, *args, **kwargs)
+        return cached_func
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:  # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Delete every cached entry."""
+        for _, _, name in self._entries():
+            os.remove(os.path.join(self.directory, name))
+
+    def stats(self):
+        """Return hit/miss counters for this instance and the current size of the cache on disk."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "uncached": self.uncached,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def report(self):
+        """Return a one-line human readable summary of stats()."""
+        s = self.stats()
+        return (f"render cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%} hit rate), "
+                f"{s['uncached']} uncached, {s['evictions']} evictions, {s['entries']} entries, "
+                f"{s['bytes'] / 1024 ** 2:.1f}/{s['max_bytes'] / 1024 ** 2:.0f} MB")
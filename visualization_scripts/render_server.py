@@ -0,0 +1,335 @@
+"""
+Long-lived local render server that keeps the plotting stack loaded between figures.
+
+A figure script spends most of a short run importing matplotlib, seaborn and pandas,
+looking up fonts and applying styles before it draws anything. The render server pays
+for this once: it starts a bounded pool of worker processes that import every figure
+module, resolve the fonts and draw a throwaway figure, then renders the figure specs it
+receives over HTTP on localhost with batch_render.render_figure, which renders every
+figure inside its own rc_context. A worker that dies is replaced by a fresh pool.
+
+A render request names either a manifest on disk or a list of figure specs in the
+manifest format (see batch_render.py), with relative paths resolved against "base_dir":
+
+    POST /render    {"manifest": "/path/to/figures.json", "only": ["heatmap"]}
+    POST /render    {"figures": [...], "base_dir": "/path/to/project", "timeout": 60}
+    GET  /status    worker count, uptime, figures rendered
+    POST /shutdown
+
+The client side of this module only needs the standard library, so a request costs
+little more than starting the interpreter. The server writes files wherever a spec asks,
+so it only listens on localhost by default.
+
+Usage:
+    python -m visualization_scripts.render_server serve --jobs 2 &
+    python -m visualization_scripts.render_server render figures.json --only heatmap
+    python -m visualization_scripts.render_server stop
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _warm_worker():
+    """Pool initializer: load everything a figure needs before the first request arrives."""
+    from .batch_render import FIGURE_FUNCTIONS, _init_worker
+
+    _init_worker()
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import pandas  # noqa: F401
+    import seaborn as sns
+
+    for module_name in {module_name for module_name, _ in FIGURE_FUNCTIONS.values()}:
+        importlib.import_module(f".{module_name}", __package__)
+    # Drawing text once loads the font cache and the glyphs of the default font
+    with matplotlib.rc_context():
+        sns.set(style="darkgrid", context="paper", palette="muted", font_scale=1.2)
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, 1], label="warm-up")
+        ax.set_title("warm-up")
+        ax.legend()
+        fig.canvas.draw()
+        plt.close(fig)
+
+
+def _ready():
+    return os.getpid()
+
+
+def _render_task(spec, timeout, cache_dir, cache_bytes, profile_phases):
+    from .batch_render import render_figure
+
+    return render_figure(spec, timeout, cache_dir, cache_bytes, profile_phases)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """
+    HTTP server rendering figure specs on a warm process pool.
+
+    Parameters:
+    - address: (host, port) to listen on
+    - jobs: Number of worker processes (default: number of CPUs)
+    - timeout: Default per-figure timeout in seconds (a spec's own "timeout" wins)
+    - cache_dir: Directory of the render cache (optional, disables caching if None)
+    - cache_bytes: Size limit of the render cache
+    - max_pending: Figures submitted to the pool at once (default: 4 per worker); the figures of
+                   larger or concurrent requests wait for a free slot, so requests of any size
+                   are accepted
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, jobs=None, timeout=None, cache_dir=None, cache_bytes=1024 ** 3, max_pending=None):
+        super().__init__(address, _Handler)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.cache_bytes = cache_bytes
+        self.max_pending = max_pending or 4 * self.jobs
+        self.pending = 0  # Figures accepted and not finished, waiting for a slot or on the pool
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.rendered = 0
+        self.failed = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.pool = None
+        self.warmup_seconds = self._start_pool()
+
+    def _start_pool(self):
+        """Start the worker processes and wait until all of them are warm; returns the seconds it took."""
+        start = time.perf_counter()
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_warm_worker)
+        # Workers are spawned on demand, so keep them all busy once to start every one of them
+        for future in [self.pool.submit(_ready) for _ in range(self.jobs)]:
+            future.result()
+        return time.perf_counter() - start
+
+    def _restart_pool(self, broken):
+        with self._lock:
+            if self.pool is broken:
+                logger.warning("A render worker died, restarting the pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._start_pool()
+
+    def _submit(self, spec, timeout, profile_phases):
+        """Submit one figure once fewer than max_pending figures are on the pool."""
+        self._slots.acquire()
+        try:
+            pool = self.pool
+            args = (spec, timeout or self.timeout, self.cache_dir, self.cache_bytes, profile_phases)
+            try:
+                future = pool.submit(_render_task, *args)
+            except BrokenProcessPool:
+                # A worker died while idle; retry once on a fresh pool
+                self._restart_pool(pool)
+                pool = self.pool
+                future = pool.submit(_render_task, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return pool, future
+
+    def render(self, specs, timeout=None, profile_phases=False):
+        """Render resolved figure specs on the pool and return their results in order."""
+        with self._lock:
+            self.pending += len(specs)
+        results = []
+        try:
+            submitted = [self._submit(spec, timeout, profile_phases) for spec in specs]
+            for spec, (pool, future) in zip(specs, submitted):
+                try:
+                    results.append(future.result())
+                except BrokenProcessPool as exc:
+                    self._restart_pool(pool)
+                    results.append({"name": spec["name"], "status": "failed", "seconds": float("nan"),
+                                    "save_path": spec.get("save_path"), "cached": False,
+                                    "error": f"{type(exc).__name__}: {exc}"})
+        finally:
+            with self._lock:
+                self.pending -= len(specs)
+                self.rendered += sum(r["status"] == "ok" for r in results)
+                self.failed += sum(r["status"] != "ok" for r in results)
+        return results
+
+    def status(self):
+        with self._lock:
+            return {"pid": os.getpid(), "jobs": self.jobs, "uptime_seconds": time.time() - self.started,
+                    "warmup_seconds": self.warmup_seconds, "pending": self.pending,
+                    "max_pending": self.max_pending, "rendered": self.rendered, "failed": self.failed}
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._reply(200, self.server.status())
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path == "/shutdown":
+            self._reply(200, {"stopping": True})
+            # shutdown() blocks until serve_forever returns, so run it off the request thread
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        if self.path != "/render":
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        from .batch_render import load_manifest, resolve_specs
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if "manifest" in request:
+                specs = load_manifest(request["manifest"])
+            else:
+                specs = resolve_specs(request["figures"], request.get("base_dir") or os.getcwd())
+        except (ValueError, KeyError, TypeError, OSError) as exc:
+            self._reply(400, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        if request.get("only"):
+            specs = [spec for spec in specs if spec["name"] in request["only"]]
+        results = self.server.render(specs, request.get("timeout"), request.get("profile", False))
+        self._reply(200, {"results": results})
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, jobs=None, timeout=None, cache_dir=None, cache_bytes=1024 ** 3,
+          max_pending=None):
+    """Start a render server and handle requests until it is stopped (POST /shutdown or Ctrl-C)."""
+    server = RenderServer((host, port), jobs=jobs, timeout=timeout, cache_dir=cache_dir, cache_bytes=cache_bytes,
+                          max_pending=max_pending)
+    logger.info("Render server on http://%s:%d with %d warm workers (%.1fs to start)", host, port, server.jobs,
+                server.warmup_seconds)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _request(url, path, payload=None, timeout=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    request = urllib.request.Request(url.rstrip("/") + path, data=data, headers={"Content-Type": "application/json"},
+                                     method="GET" if data is None else "POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        raise RuntimeError(f"render server: {json.loads(exc.read()).get('error', exc.reason)}") from None
+
+
+def render_remote(figures, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", only=None, base_dir=None, timeout=None,
+                  profile_phases=False):
+    """
+    Render figures on a running render server and return their results (see batch_render.render_figure).
+
+    Parameters:
+    - figures: Path of a manifest, or a list of raw figure specs as in a manifest
+    - url: Address of the render server
+    - only: Names of the figures to render (default: all)
+    - base_dir: Directory relative paths in a list of specs are resolved against (default: current directory)
+    - timeout: Per-figure timeout in seconds
+    - profile_phases: Also return the per-phase profile of every figure
+    """
+    if isinstance(figures, (str, os.PathLike)):
+        payload = {"manifest": os.path.abspath(figures)}
+    else:
+        payload = {"figures": list(figures), "base_dir": os.path.abspath(base_dir or os.getcwd())}
+    payload.update(only=only, timeout=timeout, profile=profile_phases)
+    return _request(url, "/render", payload)["results"]
+
+
+def server_status(url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"):
+    """Return the status of a running render server, or None if none is listening at url."""
+    try:
+        return _request(url, "/status", timeout=5)
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a warm render server running, or send figures to one.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Start the render server")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    serve_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    serve_parser.add_argument("--timeout", type=float, default=None, help="Per-figure timeout in seconds")
+    serve_parser.add_argument("--cache-dir", default=None, help="Directory of the render cache (disabled if omitted)")
+    serve_parser.add_argument("--cache-size", type=float, default=1024, help="Render cache size limit in MB")
+    serve_parser.add_argument("--max-pending", type=int, default=None, help="Figures submitted to the workers at once")
+    render_parser = subparsers.add_parser("render", help="Render the figures of a manifest on the server")
+    render_parser.add_argument("manifest", help="JSON or YAML figure manifest")
+    render_parser.add_argument("--only", nargs="+", default=None, help="Names of the figures to render")
+    render_parser.add_argument("--timeout", type=float, default=None, help="Per-figure timeout in seconds")
+    for sub in (render_parser, subparsers.add_parser("status", help="Show the server status"),
+                subparsers.add_parser("stop", help="Stop the server")):
+        sub.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help="Address of the server")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        serve(args.host, args.port, jobs=args.jobs, timeout=args.timeout, cache_dir=args.cache_dir,
+              cache_bytes=int(args.cache_size * 1024 ** 2), max_pending=args.max_pending)
+        return 0
+
+    status = server_status(args.url)
+    if status is None:
+        print(f"No render server at {args.url}; start one with "
+              f"`python -m visualization_scripts.render_server serve`")
+        return 2
+    if args.command == "status":
+        print(json.dumps(status, indent=2))
+        return 0
+    if args.command == "stop":
+        _request(args.url, "/shutdown", {})
+        return 0
+
+    start = time.perf_counter()
+    try:
+        results = render_remote(args.manifest, args.url, only=args.only, timeout=args.timeout)
+    except RuntimeError as exc:
+        print(exc)
+        return 2
+    # Printed here rather than with batch_render.print_summary, which would import NumPy into the client
+    for r in results:
+        print(f"{r['name']}: {r['status']} in {r['seconds']:.2f}s{' (cached)' if r['cached'] else ''}")
+        if r["error"]:
+            print(f"    {r['error']}")
+    ok = sum(r["status"] == "ok" for r in results)
+    print(f"{ok}/{len(results)} figures rendered in {time.perf_counter() - start:.2f}s")
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
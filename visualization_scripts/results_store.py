@@ -0,0 +1,341 @@
+"""
+Columnar on-disk store of experiment results, queried by slice.
+
+A store is a directory holding one .npy file per column plus a small meta.json. Key
+columns (by default dataset, label, method, prompt, seed and train_size) are dictionary
+encoded as integer codes, and all rows are sorted by the keys. A composite index over the
+leading keys turns equality filters on them into a few contiguous row ranges found by
+binary search. Columns are opened as read-only memory maps, so a query only touches the
+pages of the rows and columns it asks for, never the whole table.
+
+Example:
+    store = ResultsStore.write("results_store", df)       # df holds one row per run
+    store = ResultsStore("results_store")
+    scores, (datasets, methods) = store.array(["dataset", "method"], "f1", prompt="base")
+    generate_bar_chart(scores, datasets, methods)
+
+In batch_render manifests, {"$results": "results_store", "dims": [...], "value": "f1",
+"where": {...}} arguments are filled from a store the same way (see batch_render.py).
+
+Usage:
+    python -m visualization_scripts.results_store build runs.csv results_store
+    python -m visualization_scripts.results_store info results_store
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+
+import numpy as np
+
+KEY_COLUMNS = ("dataset", "label", "method", "prompt", "seed", "train_size")
+
+# Most row ranges a query may split into before the remaining filters are applied as masks
+MAX_RANGES = 4096
+
+
+def _encode(values):
+    """
+    Dictionary-encode a column: returns (sorted categories, codes in the smallest unsigned dtype).
+
+    Missing cells (None or NaN) of object columns, e.g. empty CSV cells of a text column,
+    become "" so the column can be sorted.
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        missing = np.array([value is None or value != value for value in values], dtype=bool)
+        if missing.any():
+            values = values.copy()
+            values[missing] = ""
+    categories, codes = np.unique(values, return_inverse=True)
+    return categories, codes.astype(np.min_scalar_type(max(len(categories) - 1, 0))).ravel()
+
+
+def _prefix_length(cardinalities):
+    """Number of leading keys whose combined codes fit in one int64."""
+    product = 1
+    for i, cardinality in enumerate(cardinalities):
+        product *= max(cardinality, 1)
+        if product >= 2 ** 62:
+            return i
+    return len(cardinalities)
+
+
+class ResultsStore:
+    """
+    Read-only view of a results store directory.
+
+    Parameters:
+    - directory: Directory written by ResultsStore.write
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        self.rows = meta["rows"]
+        self.keys = meta["keys"]
+        self.columns = list(meta["columns"])
+        self.categories = {name: np.asarray(column["categories"])
+                           for name, column in meta["columns"].items() if column["categories"] is not None}
+        self.prefix_keys = self.keys[:meta["prefix_length"]]
+        self._columns = {}
+
+    @classmethod
+    def write(cls, directory, table, keys=KEY_COLUMNS):
+        """
+        Write a table of results as a store, replacing any existing store at `directory`.
+
+        Parameters:
+        - directory: Target directory
+        - table: DataFrame or dict of equal-length columns, one row per run
+        - keys: Columns to index, most selective first (they must all be in `table`)
+
+        Non-numeric value columns are dictionary encoded like the keys; missing text cells are
+        stored as "". Returns the opened store.
+        """
+        names = list(table)
+        keys = [key for key in keys if key in names] if keys is KEY_COLUMNS else list(keys)
+        missing = set(keys) - set(names)
+        if missing:
+            raise ValueError(f"Key columns {sorted(missing)} are not in the table")
+
+        columns, meta_columns = {}, {}
+        for name in names:
+            values = np.asarray(table[name])
+            if name in keys or not np.issubdtype(values.dtype, np.number):
+                categories, values = _encode(values)
+                meta_columns[name] = {"categories": categories.tolist()}
+            else:
+                meta_columns[name] = {"categories": None}
+            columns[name] = values
+        rows = len(columns[names[0]]) if names else 0
+
+        # Sort rows by the keys (np.lexsort sorts by its last array first)
+        order = np.lexsort([columns[key] for key in reversed(keys)]) if keys else np.arange(rows)
+        cardinalities = [len(meta_columns[key]["categories"]) for key in keys]
+        prefix_length = _prefix_length(cardinalities)
+
+        tmp_dir = directory.rstrip(os.sep) + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for name, values in columns.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), values[order])
+        prefix = np.zeros(rows, dtype=np.int64)
+        for key, cardinality in zip(keys[:prefix_length], cardinalities):
+            prefix = prefix * cardinality + columns[key][order]
+        np.save(os.path.join(tmp_dir, "_prefix.npy"), prefix)
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"rows": rows, "keys": keys, "prefix_length": prefix_length, "columns": meta_columns}, f)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+        return cls(directory)
+
+    def __len__(self):
+        return self.rows
+
+    def _column(self, name):
+        if name not in self._columns:
+            if name != "_prefix" and name not in self.columns:
+                raise KeyError(f"Unknown column {name!r}, expected one of {self.columns}")
+            self._columns[name] = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="r")
+        return self._columns[name]
+
+    def _codes(self, name, values, ordered=False):
+        """
+        Codes of the requested values of a dictionary-encoded column; unknown values are dropped.
+
+        The codes are sorted, or kept in the order of `values` (without duplicates) if `ordered`.
+        """
+        categories = self.categories[name]
+        values = np.asarray(values if isinstance(values, (list, tuple, np.ndarray)) else [values])
+        if not len(categories) or not len(values):
+            return np.empty(0, dtype=np.intp)
+        positions = np.searchsorted(categories, values).clip(max=len(categories) - 1)
+        positions = positions[categories[positions] == values]
+        if not ordered:
+            return np.unique(positions)
+        return positions[np.sort(np.unique(positions, return_index=True)[1])]
+
+    def _row_ranges(self, codes):
+        """
+        Contiguous (start, stop) row ranges matching the filters on the leading keys.
+
+        Returns the ranges and the keys whose filters they fully apply.
+        """
+        prefix_codes = []
+        for key in self.prefix_keys:
+            if key not in codes:
+                break
+            combinations = np.prod([len(c) for c in prefix_codes + [codes[key]]])
+            if combinations > MAX_RANGES:
+                break
+            prefix_codes.append(codes[key])
+        if not prefix_codes:
+            return [(0, self.rows)], []
+
+        cardinalities = [len(self.categories[key]) for key in self.prefix_keys]
+        strides = np.cumprod([1] + cardinalities[::-1])[::-1][1:]
+        span = strides[len(prefix_codes) - 1]
+        starts = np.array([np.dot(combination, strides[:len(prefix_codes)])
+                           for combination in itertools.product(*prefix_codes)], dtype=np.int64)
+        prefix = self._column("_prefix")
+        lo = np.searchsorted(prefix, starts, side="left")
+        hi = np.searchsorted(prefix, starts + span, side="left")
+        ranges = [(start, stop) for start, stop in zip(lo, hi) if stop > start]
+        return ranges, self.prefix_keys[:len(prefix_codes)]
+
+    def _select(self, where):
+        """Return (row ranges, mask over the rows of those ranges or None) for the filters."""
+        codes = {}
+        for name, values in where.items():
+            if name not in self.columns:
+                raise KeyError(f"Unknown column {name!r}, expected one of {self.columns}")
+            if name in self.categories:
+                codes[name] = self._codes(name, values)
+            else:
+                codes[name] = np.atleast_1d(values)
+        ranges, applied = self._row_ranges({name: c for name, c in codes.items() if name in self.categories})
+
+        mask = None
+        for name, wanted in codes.items():
+            if name in applied:
+                continue
+            values = self._gather(name, ranges)
+            if name in self.categories:
+                allowed = np.zeros(len(self.categories[name]), dtype=bool)
+                allowed[wanted] = True
+                matches = allowed[values]
+            else:
+                matches = np.isin(values, wanted)
+            mask = matches if mask is None else mask & matches
+        return ranges, mask
+
+    def _gather(self, name, ranges, mask=None):
+        column = self._column(name)
+        values = np.concatenate([column[start:stop] for start, stop in ranges]) if ranges else column[:0]
+        return np.asarray(values if mask is None else values[mask])
+
+    def query(self, columns=None, **where):
+        """
+        Read the rows matching the filters.
+
+        Parameters:
+        - columns: Columns to return (default: all)
+        - where: Filters as column=value or column=[values, ...]
+
+        Returns a dict of column name -> NumPy array, with encoded columns decoded.
+        """
+        ranges, mask = self._select(where)
+        result = {}
+        for name in columns or self.columns:
+            values = self._gather(name, ranges, mask)
+            result[name] = self.categories[name][values] if name in self.categories else values
+        return result
+
+    def to_frame(self, columns=None, **where):
+        """Like query, but return a pandas DataFrame (long format, one row per run)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.query(columns, **where))
+
+    def _label_codes(self, dim, where, ranges, mask):
+        """Codes of the labels along `dim` of the selected rows, in the order labels() reports them."""
+        present = np.unique(self._gather(dim, ranges, mask))
+        if isinstance(where.get(dim), (list, tuple, np.ndarray)):
+            order = self._codes(dim, where[dim], ordered=True)
+            return order[np.isin(order, present)]
+        return present
+
+    def labels(self, dim, **where):
+        """
+        Labels along `dim` of the rows matching the filters, in the order array() uses.
+
+        If `dim` is itself filtered with a list of values, that list (minus absent values) gives
+        the order; otherwise the labels are sorted.
+        """
+        ranges, mask = self._select(where)
+        return self.categories[dim][self._label_codes(dim, where, ranges, mask)].tolist()
+
+    def array(self, dims, value, agg="mean", **where):
+        """
+        Aggregate a value column into a dense array with one axis per dimension.
+
+        Parameters:
+        - dims: Key columns to keep as axes, e.g. ["dataset", "method"] for generate_bar_chart
+                or ["group", "model", "train_size", "seed"] for plot_score_curves
+        - value: Numeric column to aggregate
+        - agg: "mean", "sum", "min", "max" or "count", applied over all rows falling in the
+               same cell (e.g. over seeds when "seed" is not in dims)
+        - where: Filters as column=value or column=[values, ...]
+
+        Returns (array, labels): labels holds the labels of each axis (see labels()); cells
+        without any row are NaN (0 for "count").
+        """
+        ranges, mask = self._select(where)
+        labels, positions = [], []
+        for dim in dims:
+            codes = self._label_codes(dim, where, ranges, mask)
+            lookup = np.zeros(len(self.categories[dim]), dtype=np.intp)
+            lookup[codes] = np.arange(len(codes))
+            labels.append(self.categories[dim][codes].tolist())
+            positions.append(lookup[self._gather(dim, ranges, mask)])
+        shape = tuple(len(dim_labels) for dim_labels in labels)
+        values = self._gather(value, ranges, mask).astype(float)
+        flat = np.ravel_multi_index(positions, shape) if dims else np.zeros(len(values), dtype=np.intp)
+        size = int(np.prod(shape))
+
+        counts = np.bincount(flat, minlength=size)
+        if agg == "count":
+            return counts.reshape(shape), labels
+        if agg in ("mean", "sum"):
+            result = np.bincount(flat, weights=values, minlength=size)
+            if agg == "mean":
+                result = result / np.where(counts, counts, 1)
+        elif agg in ("min", "max"):
+            ufunc = np.minimum if agg == "min" else np.maximum
+            result = np.full(size, np.inf if agg == "min" else -np.inf)
+            ufunc.at(result, flat, values)
+        else:
+            raise ValueError(f"Unknown aggregation {agg!r}, expected mean, sum, min, max or count")
+        result[counts == 0] = np.nan
+        return result.reshape(shape), labels
+
+    def info(self):
+        """Return a short human readable description of the store."""
+        lines = [f"{self.directory}: {self.rows} rows, keys {self.keys} (indexed prefix {self.prefix_keys})"]
+        for name in self.columns:
+            column = self._column(name)
+            kind = f"{len(self.categories[name])} categories" if name in self.categories else str(column.dtype)
+            lines.append(f"  {name:<16} {kind:<20} {column.nbytes / 1024 ** 2:8.1f} MB")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a results store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build a store from a CSV or JSONL results table")
+    build.add_argument("table", help="CSV or JSONL file with one row per run")
+    build.add_argument("directory", help="Store directory (replaced if it exists)")
+    build.add_argument("--keys", nargs="+", default=list(KEY_COLUMNS), help="Key columns to index, in order")
+    info = subparsers.add_parser("info", help="Describe a store")
+    info.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        import pandas as pd
+
+        if args.table.endswith((".jsonl", ".json")):
+            table = pd.read_json(args.table, lines=args.table.endswith(".jsonl"))
+        else:
+            table = pd.read_csv(args.table)
+        store = ResultsStore.write(args.directory, table, keys=[key for key in args.keys if key in table])
+    else:
+        store = ResultsStore(args.directory)
+    print(store.info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Paired bootstrap and permutation tests for all method pairs on all datasets at once.
+
+The comparison charts plot one score per (dataset, method). This module measures how
+much of the difference between two methods could be noise, from either per-example
+predictions (scored with macro-F1 or accuracy, in percent) or per-seed scores (compared
+by their mean). Both tests are paired: resamples pick the same examples (or seeds) for
+every method on a dataset.
+
+Every resample is a weighting of the examples, so the tests reduce to matrix products.
+Each example is encoded once as count columns per method. For macro-F1 these are
+true-positive and predicted indicators per class; for accuracy and per-seed scores there
+is a single value column. A chunk of resamples is then one (resamples x examples) weight
+matrix times these columns:
+
+- bootstrap: the weights are how often each example was drawn. The resampled scores give
+  percentile intervals per method and, for every pair, p = P(|d* - d| >= |d|), where d
+  is the observed score difference and d* the resampled one;
+- permutation: the weights are random 0/1 swaps of the two methods' predictions, applied
+  to per-pair difference columns. The p-value is P(|d*| >= |d|).
+
+Resamples are processed in chunks bounded by max_bytes. Datasets can be spread over
+worker processes; each dataset gets its own random stream, so the results do not depend
+on `jobs`.
+
+Example:
+    result = compare_methods(predictions=predictions, gold=gold, n_resamples=2000)
+    generate_bar_chart(result["score"], datasets, methods,
+                       errors=interval_errors(result["score"], result["lower"], result["upper"]),
+                       significance=significance_markers(result["p_values"], result["score"], reference=0))
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+METRICS = ("f1_macro", "accuracy", "mean")
+TESTS = ("bootstrap", "permutation")
+
+
+def _columns(predictions, gold, metric):
+    """
+    Encode one dataset as per-example count columns.
+
+    Returns (columns of shape (n, num_methods, k), gold columns of shape (n, num_classes)
+    or None). For f1_macro the k = 2 * num_classes columns are the true-positive and the
+    predicted indicators of every class; otherwise k = 1.
+    """
+    if metric == "mean":
+        # Per-seed scores, shape (num_methods, num_seeds); seeds missing for any method cannot be paired
+        values = np.asarray(predictions, dtype=float)
+        values = values[:, ~np.isnan(values).any(axis=0)]
+        return values.T[:, :, None], None
+    predictions, gold = np.asarray(predictions), np.asarray(gold)
+    if metric == "accuracy":
+        return (predictions == gold).T[:, :, None].astype(float, order="C"), None
+    classes = np.unique(np.concatenate([gold, predictions.ravel()]))
+    predicted = predictions.T[:, :, None] == classes  # (n, methods, classes)
+    true = gold[:, None] == classes
+    # C order, so the (examples, methods * k) view the resamples are multiplied with is not a copy
+    columns = np.concatenate([predicted & true[:, None, :], predicted], axis=-1).astype(float, order="C")
+    return columns, true.astype(float)
+
+
+def _metric(totals, gold_totals, metric, num_examples):
+    """
+    Scores from summed count columns.
+
+    totals has shape (..., num_methods, k) and gold_totals (..., num_classes). Macro-F1
+    averages the classes that occur among the gold labels or predictions of the resample.
+    """
+    if metric != "f1_macro":
+        return totals[..., 0] / num_examples * (100 if metric == "accuracy" else 1)
+    num_classes = gold_totals.shape[-1]
+    true_positives, predicted = totals[..., :num_classes], totals[..., num_classes:]
+    denominator = predicted + gold_totals[..., None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        f1 = np.where(denominator > 0, 2 * true_positives / denominator, np.nan)
+        return 100 * np.nanmean(f1, axis=-1)
+
+
+def _chunk_size(num_examples, num_columns, max_bytes):
+    # Per resample, two 8-byte rows of num_examples are alive at once (the draws and their
+    # counts, then the counts and their float weights), plus the column totals and the few
+    # arrays of that size the metric derives from them
+    return max(1, int(max_bytes // (8 * (2 * num_examples + 4 * num_columns))))
+
+
+def _test_dataset(predictions, gold, metric, test, n_resamples, ci, seed, max_bytes):
+    """
+    Run one dataset's tests. Returns (score, lower, upper, p_values) with shapes
+    (num_methods,), (num_methods,), (num_methods,) and (num_methods, num_methods).
+    """
+    columns, gold_columns = _columns(predictions, gold, metric)
+    num_examples, num_methods, k = columns.shape
+    score = _metric(columns.sum(axis=0), None if gold_columns is None else gold_columns.sum(axis=0), metric,
+                    num_examples)
+    observed = score[:, None] - score[None, :]
+    p_values = np.full((num_methods, num_methods), np.nan)
+    lower = upper = np.full(num_methods, np.nan)
+    if num_examples == 0:
+        return score, lower, upper, p_values
+    rng = np.random.default_rng(seed)
+    flat = columns.reshape(num_examples, num_methods * k)
+
+    if test == "bootstrap" or ci:
+        gold_width = 0 if gold_columns is None else gold_columns.shape[1]
+        chunk = _chunk_size(num_examples, flat.shape[1] + gold_width, max_bytes)
+        samples = []
+        for start in range(0, n_resamples, chunk):
+            size = min(chunk, n_resamples - start)
+            draws = rng.integers(0, num_examples, size=(size, num_examples))
+            # Row r of the weights counts how often each example was drawn in resample r
+            draws += num_examples * np.arange(size)[:, None]
+            counts = np.bincount(draws.ravel(), minlength=size * num_examples)
+            del draws
+            weights = counts.reshape(size, num_examples).astype(float)
+            del counts
+            totals = (weights @ flat).reshape(size, num_methods, k)
+            gold_totals = None if gold_columns is None else weights @ gold_columns
+            del weights  # Free this chunk's weights before the next chunk draws
+            samples.append(_metric(totals, gold_totals, metric, num_examples))
+        samples = np.concatenate(samples)  # (n_resamples, num_methods)
+        if ci:
+            lower, upper = np.nanpercentile(samples, [50 - ci / 2, 50 + ci / 2], axis=0)
+        if test == "bootstrap":
+            for i in range(num_methods):
+                shifted = np.abs(samples[:, i, None] - samples - observed[i])
+                p_values[i] = (1 + (shifted >= np.abs(observed[i]) - 1e-12).sum(axis=0)) / (n_resamples + 1)
+
+    if test == "permutation":
+        first, second = np.triu_indices(num_methods, k=1)
+        # Swapping an example between methods i and j moves (column_j - column_i) from i to j
+        differences = (columns[:, second] - columns[:, first]).reshape(num_examples, -1)
+        base = columns.sum(axis=0)
+        gold_totals = None if gold_columns is None else gold_columns.sum(axis=0)
+        chunk = _chunk_size(num_examples, differences.shape[1], max_bytes)
+        exceed = np.zeros(len(first))
+        for start in range(0, n_resamples, chunk):
+            size = min(chunk, n_resamples - start)
+            swaps = rng.integers(0, 2, size=(size, num_examples))
+            swaps = swaps.astype(float)
+            moved = (swaps @ differences).reshape(size, len(first), k)
+            del swaps
+            delta = (_metric(base[first] + moved, gold_totals, metric, num_examples)
+                     - _metric(base[second] - moved, gold_totals, metric, num_examples))
+            exceed += (np.abs(delta) >= np.abs(observed[first, second]) - 1e-12).sum(axis=0)
+        p_values[first, second] = p_values[second, first] = (1 + exceed) / (n_resamples + 1)
+    np.fill_diagonal(p_values, np.nan)
+    return score, lower, upper, p_values
+
+
+def _run(task):
+    return _test_dataset(*task)
+
+
+def compare_methods(predictions=None, gold=None, scores=None, metric="f1_macro", test="bootstrap",
+                    n_resamples=1000, ci=95, seed=0, max_bytes=256 * 1024 ** 2, jobs=None):
+    """
+    Test every pair of methods on every dataset for a significant difference.
+
+    Parameters:
+    - predictions: Per-example predictions, one array of shape (num_methods, num_examples) per
+      dataset (or a single 3D array when all datasets have the same number of examples)
+    - gold: Gold labels, one array of shape (num_examples,) per dataset
+    - scores: Per-seed scores of shape (num_datasets, num_methods, num_seeds), instead of
+      predictions; NaN marks missing runs, and seeds missing for any method are dropped
+    - metric: "f1_macro" or "accuracy" for predictions (both in percent); scores are always averaged
+    - test: "bootstrap" (paired bootstrap) or "permutation" (paired approximate randomization)
+    - n_resamples: Number of resamples per dataset
+    - ci: Confidence level in percent of the bootstrap intervals of each method (None to skip them;
+      with test="permutation" they need a separate bootstrap pass)
+    - seed: Random seed
+    - max_bytes: Memory budget of one chunk of resamples
+    - jobs: Number of processes the datasets are spread over (default: run in-process)
+
+    Returns a dict with "score", "lower" and "upper" of shape (num_datasets, num_methods) and
+    "p_values" of shape (num_datasets, num_methods, num_methods), symmetric with a NaN diagonal.
+    """
+    if test not in TESTS:
+        raise ValueError(f"test must be one of {TESTS}, got {test!r}")
+    if scores is not None:
+        metric, datasets = "mean", [(dataset_scores, None) for dataset_scores in np.asarray(scores, dtype=float)]
+    elif predictions is not None and gold is not None:
+        if metric not in METRICS[:2]:
+            raise ValueError(f"metric must be one of {METRICS[:2]}, got {metric!r}")
+        datasets = list(zip(predictions, gold))
+    else:
+        raise ValueError("Pass either predictions and gold, or scores")
+
+    seeds = np.random.SeedSequence(seed).spawn(len(datasets))
+    tasks = [(dataset_predictions, dataset_gold, metric, test, n_resamples, ci, dataset_seed, max_bytes)
+             for (dataset_predictions, dataset_gold), dataset_seed in zip(datasets, seeds)]
+    if jobs and jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks), os.cpu_count() or 1)) as pool:
+            results = list(pool.map(_run, tasks))
+    else:
+        results = [_run(task) for task in tasks]
+
+    score, lower, upper, p_values = (np.stack(parts) for parts in zip(*results))
+    return {"score": score, "lower": lower, "upper": upper, "p_values": p_values, "test": test,
+            "n_resamples": n_resamples}
+
+
+def interval_errors(score, lower, upper):
+    """Turn intervals into the (2, num_datasets, num_methods) asymmetric errors generate_bar_chart takes."""
+    score = np.asarray(score, dtype=float)
+    return np.stack([score - np.asarray(lower), np.asarray(upper) - score]).clip(min=0)
+
+
+def significance_markers(p_values, score, reference=None, thresholds=(0.05, 0.01, 0.001)):
+    """
+    Star markers ("*", "**", "***") per (dataset, method) for the charts' significance argument.
+
+    Parameters:
+    - p_values: Array of shape (num_datasets, num_methods, num_methods), as from compare_methods
+    - score: Array of shape (num_datasets, num_methods)
+    - reference: Index of a baseline method; every method scoring above it is marked by its
+      test against it. If None, only the best method of each dataset is marked, by its weakest win over any
+      other method.
+    - thresholds: p-value thresholds of one, two and three stars
+
+    Returns an object array of shape (num_datasets, num_methods) of strings, "" where not significant.
+    """
+    p_values, score = np.asarray(p_values, dtype=float), np.asarray(score, dtype=float)
+    if reference is not None:
+        p = np.where(score > score[:, reference, None], p_values[:, :, reference], np.nan)
+    else:
+        rows = np.arange(score.shape[0])
+        best = np.nanargmax(score, axis=1)
+        p = np.full(score.shape, np.nan)
+        p[rows, best] = np.nanmax(p_values[rows, best], axis=1)
+    stars = (p[..., None] < np.asarray(thresholds)).sum(axis=-1)
+    return np.array(["", "*", "**", "***"], dtype=object)[np.minimum(stars, 3)]